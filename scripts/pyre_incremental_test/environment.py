@@ -1,9 +1,10 @@
 import logging
 import subprocess
+import tempfile
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Container, Optional
+from typing import Container, Optional, Tuple
 
 
 LOG: logging.Logger = logging.getLogger(__name__)
@@ -11,15 +12,36 @@ LOG: logging.Logger = logging.getLogger(__name__)
 
 @dataclass(frozen=True)
 class CommandOutput:
+    # Declared by hand since `dataclass(slots=True)` needs Python 3.10. This only
+    # works because none of the fields has a default value.
+    __slots__ = ("return_code", "stdout", "stderr")
+
     return_code: int
     stdout: str
     stderr: str
 
+    # The default slot-state restore goes through the frozen `__setattr__`, which
+    # would break `copy` and `pickle`; do what `dataclass(slots=True)` does.
+    def __getstate__(self) -> Tuple[int, str, str]:
+        return (self.return_code, self.stdout, self.stderr)
+
+    def __setstate__(self, state: Tuple[int, str, str]) -> None:
+        for name, value in zip(self.__slots__, state):
+            object.__setattr__(self, name, value)
+
 
 class EnvironmentException(Exception):
     pass
 
 
+def _truncate_output(output: str, limit: int = 2048) -> str:
+    # A failing pyre run can print megabytes; only keep both ends of it.
+    if len(output) <= 2 * limit:
+        return output
+    omitted = len(output) - 2 * limit
+    return f"{output[:limit]}\n...[{omitted} characters omitted]...\n{output[-limit:]}"
+
+
 class Environment(ABC):
     pyre_binary_override: Optional[str] = None
     typeshed_override: Optional[str] = None
@@ -44,8 +66,8 @@ class Environment(ABC):
                 f'Running command "{command}" '
                 f"under {working_directory} "
                 f"returns {output.return_code}.\n"
-                f"Stdout = {output.stdout}\n"
-                f"Stderr = {output.stderr}"
+                f"Stdout = {_truncate_output(output.stdout)}\n"
+                f"Stderr = {_truncate_output(output.stderr)}"
             )
             raise EnvironmentException(message)
         return output
@@ -59,14 +81,21 @@ class SubprocessEnvironment(Environment):
             f"Invoking subprocess `{command}` at `{working_directory}`"
             f"{' with stdin' if stdin is not None else ''}"
         )
-        result = subprocess.run(
-            command.split(),
-            cwd=working_directory,
-            universal_newlines=True,
-            input=stdin,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-        )
-        return CommandOutput(
-            return_code=result.returncode, stdout=result.stdout, stderr=result.stderr
-        )
+        # Send output to temporary files rather than pipes, so that a chatty
+        # child never stalls on a full pipe buffer. The output is read back as
+        # raw bytes and decoded once.
+        with tempfile.TemporaryFile() as stdout, tempfile.TemporaryFile() as stderr:
+            result = subprocess.run(
+                command.split(),
+                cwd=working_directory,
+                input=stdin.encode("utf-8") if stdin is not None else None,
+                stdout=stdout,
+                stderr=stderr,
+            )
+            stdout.seek(0)
+            stderr.seek(0)
+            return CommandOutput(
+                return_code=result.returncode,
+                stdout=stdout.read().decode("utf-8", errors="replace"),
+                stderr=stderr.read().decode("utf-8", errors="replace"),
+            )
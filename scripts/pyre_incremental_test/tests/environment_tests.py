@@ -0,0 +1,97 @@
+import copy
+import pickle
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from typing import Optional
+
+from ..environment import (
+    CommandOutput,
+    Environment,
+    EnvironmentException,
+    SubprocessEnvironment,
+)
+
+
+class FailingEnvironment(Environment):
+    def __init__(self, stdout: str) -> None:
+        self.stdout = stdout
+
+    def run(
+        self, working_directory: Path, command: str, stdin: Optional[str]
+    ) -> CommandOutput:
+        return CommandOutput(return_code=1, stdout=self.stdout, stderr="error")
+
+
+class EnvironmentTest(unittest.TestCase):
+    def test_command_output(self) -> None:
+        output = CommandOutput(return_code=0, stdout="out", stderr="err")
+        self.assertEqual(output, CommandOutput(0, "out", "err"))
+        self.assertFalse(hasattr(output, "__dict__"))
+        with self.assertRaises(AttributeError):
+            output.return_code = 1  # pyre-ignore[41]
+
+        self.assertEqual(copy.copy(output), output)
+        self.assertEqual(copy.deepcopy(output), output)
+        self.assertEqual(pickle.loads(pickle.dumps(output)), output)
+
+    def test_checked_run_truncates_output(self) -> None:
+        stdout = "head" + "x" * 100000 + "tail"
+        with self.assertRaises(EnvironmentException) as context:
+            FailingEnvironment(stdout).checked_run(Path("."), "pyre check")
+        message = str(context.exception)
+        self.assertLess(len(message), 5000)
+        self.assertIn("Stdout = head", message)
+        self.assertIn("tail\nStderr = error", message)
+        self.assertIn("characters omitted", message)
+
+        with self.assertRaises(EnvironmentException) as context:
+            FailingEnvironment("short").checked_run(Path("."), "pyre check")
+        self.assertIn("Stdout = short\nStderr = error", str(context.exception))
+
+
+_CHILD_SCRIPT = """
+import sys
+
+mode = sys.argv[1]
+if mode == "arguments":
+    print(sys.argv[2:])
+elif mode == "upper":
+    print(sys.stdin.read().upper())
+elif mode == "invalid_utf8":
+    sys.stderr.buffer.write(b"\\xff")
+elif mode == "large":
+    print("x" * 1000000)
+    print("y" * 1000000, file=sys.stderr)
+"""
+
+
+class SubprocessEnvironmentTest(unittest.TestCase):
+    def test_run(self) -> None:
+        environment = SubprocessEnvironment()
+        with tempfile.TemporaryDirectory() as directory:
+            script = Path(directory) / "child.py"
+            script.write_text(_CHILD_SCRIPT)
+            child = f"{sys.executable} {script}"
+
+            # Commands are split on whitespace only: quotes reach the child as
+            # they are, e.g. in `pyre query save_server_state('...')`.
+            output = environment.run(
+                Path("."), f"{child} arguments query save_server_state('/tmp/x')", None
+            )
+            self.assertEqual(output.return_code, 0)
+            self.assertEqual(
+                output.stdout, "['query', \"save_server_state('/tmp/x')\"]\n"
+            )
+
+            output = environment.run(Path("."), f"{child} upper", "hello")
+            self.assertEqual(output.stdout, "HELLO\n")
+
+            output = environment.run(Path("."), f"{child} invalid_utf8", None)
+            self.assertEqual(output.stderr, "\ufffd")
+
+            # Larger than a pipe buffer on either stream.
+            output = environment.run(Path("."), f"{child} large", None)
+            self.assertEqual(output.stdout, "x" * 1000000 + "\n")
+            self.assertEqual(output.stderr, "y" * 1000000 + "\n")
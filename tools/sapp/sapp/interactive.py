@@ -9,9 +9,12 @@ import os
 import sys
 from collections import defaultdict
 from typing import (
+    AbstractSet,
+    Any,
     Callable,
     DefaultDict,
     Dict,
+    FrozenSet,
     Iterable,
     List,
     NamedTuple,
@@ -192,8 +195,8 @@ details              show additional information about the current trace frame
         self.current_issue_instance_id: int = -1
         self.current_frame_id: int = -1
 
-        self.sources: Set[str] = set()
-        self.sinks: Set[str] = set()
+        self.sources: FrozenSet[str] = frozenset()
+        self.sinks: FrozenSet[str] = frozenset()
         self.features: Set[str] = set()
         self.sources_dict: Dict[int, str] = {}
         self.sinks_dict: Dict[int, str] = {}
@@ -209,8 +212,21 @@ details              show additional information about the current trace frame
         # history_key on self.prompt().
         self.prompt_history: Dict[str, History] = {}
 
+        # create_models reflects every table, so only do it on the first setup.
+        self.models_created: bool = False
+
+        # The last rendered issues() listing, keyed on the run and the filters
+        # used. Only one is kept since a listing of a large run can be big.
+        # Finished runs don't change, so it only goes stale on setup().
+        self.last_issue_strings: Optional[
+            Tuple[Tuple[Any, ...], Tuple[str, ...]]
+        ] = None
+
     def setup(self) -> Dict[str, Callable]:
-        create_models(self.db)
+        if not self.models_created:
+            create_models(self.db)
+            self.models_created = True
+        self.last_issue_strings = None
         with self.db.make_session() as session:
             latest_run_id = (
                 session.query(func.max(Run.id))
@@ -262,8 +278,8 @@ details              show additional information about the current trace frame
         print(f"           Current run: {self.current_run_id}")
         print(f"Current issue instance: {self.current_issue_instance_id}")
         print(f"   Current trace frame: {self.current_frame_id}")
-        print(f"        Sources filter: {self.sources}")
-        print(f"          Sinks filter: {self.sinks}")
+        print(f"        Sources filter: {set(self.sources)}")
+        print(f"          Sinks filter: {set(self.sinks)}")
 
     @catch_keyboard_interrupt()
     def runs(self, use_pager=None):
@@ -409,12 +425,16 @@ details              show additional information about the current trace frame
                 )
                 return
 
-            self.sources = self._get_leaves_issue_instance(
-                session, issue_instance_id, SharedTextKind.SOURCE
+            self.sources = frozenset(
+                self._get_leaves_issue_instance(
+                    session, issue_instance_id, SharedTextKind.SOURCE
+                )
             )
 
-            self.sinks = self._get_leaves_issue_instance(
-                session, issue_instance_id, SharedTextKind.SINK
+            self.sinks = frozenset(
+                self._get_leaves_issue_instance(
+                    session, issue_instance_id, SharedTextKind.SINK
+                )
             )
 
             self.features = self._get_leaves_issue_instance(
@@ -591,20 +611,38 @@ details              show additional information about the current trace frame
                 exclude_features = [exclude_features]
             builder = builder.where_exclude_features(exclude_features)
 
-        with self.db.make_session() as session:
-            builder = builder.with_session(session)
-            issues = builder.get()
-            sources_list = builder.sources(issues)
-            sinks_list = builder.sinks(issues)
-            features_list = builder.features(issues)
-
-        issue_strings = []
-        for issue, sources, sinks, features in zip(
-            issues, sources_list, sinks_list, features_list
-        ):
-            issue_strings.append(
+        cache_key = (self.current_run_id,) + tuple(
+            tuple(value) if isinstance(value, list) else value
+            for value in (
+                codes,
+                callables,
+                filenames,
+                all_features,
+                any_features,
+                exclude_features,
+                exact_trace_length_to_sources,
+                exact_trace_length_to_sinks,
+                max_trace_length_to_sources,
+                max_trace_length_to_sinks,
+            )
+        )
+        if self.last_issue_strings and self.last_issue_strings[0] == cache_key:
+            issue_strings = self.last_issue_strings[1]
+        else:
+            with self.db.make_session() as session:
+                builder = builder.with_session(session)
+                issues = builder.get()
+                sources_list = builder.sources(issues)
+                sinks_list = builder.sinks(issues)
+                features_list = builder.features(issues)
+
+            issue_strings = tuple(
                 self._create_issue_output_string(issue, sources, sinks, features)
+                for issue, sources, sinks, features in zip(
+                    issues, sources_list, sinks_list, features_list
+                )
             )
+            self.last_issue_strings = (cache_key, issue_strings)
 
         issue_output = f"\n{'-' * 80}\n".join(issue_strings)
         pager(issue_output)
@@ -726,23 +764,27 @@ details              show additional information about the current trace frame
                 return
 
             if selected_frame.kind == TraceKind.POSTCONDITION:
-                self.sinks = set()
-                self.sources = TraceOperator.get_leaves_trace_frame(
-                    self.leaf_dicts,
-                    session,
-                    int(selected_frame.id),
-                    SharedTextKind.SOURCE,
+                self.sinks = frozenset()
+                self.sources = frozenset(
+                    TraceOperator.get_leaves_trace_frame(
+                        self.leaf_dicts,
+                        session,
+                        int(selected_frame.id),
+                        SharedTextKind.SOURCE,
+                    )
                 )
 
             else:
-                self.sinks = TraceOperator.get_leaves_trace_frame(
-                    self.leaf_dicts,
-                    session,
-                    int(selected_frame.id),
-                    SharedTextKind.SINK,
+                self.sinks = frozenset(
+                    TraceOperator.get_leaves_trace_frame(
+                        self.leaf_dicts,
+                        session,
+                        int(selected_frame.id),
+                        SharedTextKind.SINK,
+                    )
                 )
 
-                self.sources = set()
+                self.sources = frozenset()
 
         self.current_frame_id = int(selected_frame.id)
         self.current_issue_instance_id = -1
@@ -878,7 +920,7 @@ details              show additional information about the current trace frame
             TraceTuple(trace_frame=first_trace_frame, placeholder=True)
         ]
 
-        self.trace_tuples = self._create_trace_tuples(navigation)
+        self.trace_tuples = TraceOperator.create_trace_tuples(navigation)
 
         if trace_frame.kind == TraceKind.POSTCONDITION:
             self.trace_tuples = self.trace_tuples[::-1] + placeholder_tuple
@@ -934,23 +976,26 @@ details              show additional information about the current trace frame
         )
 
         branches = self._get_trace_frame_branches(session)
+        if not branches:
+            return branches, []
 
-        leaves_strings = []
-        for frame in branches:
-            leaves_strings.append(
-                ", ".join(
-                    [
-                        leaf
-                        for leaf in TraceOperator.get_leaves_trace_frame(
-                            self.leaf_dicts,
-                            session,
-                            int(frame.id),
-                            TraceOperator.trace_kind_to_shared_text_kind(frame.kind),
-                        )
-                        if leaf in filter_leaves
-                    ]
-                )
+        # Branches are siblings, so they all share one trace kind.
+        leaves_by_trace_frame = TraceOperator.get_leaves_trace_frames(
+            self.leaf_dicts,
+            session,
+            [int(frame.id) for frame in branches],
+            TraceOperator.trace_kind_to_shared_text_kind(branches[0].kind),
+        )
+        leaves_strings = [
+            ", ".join(
+                [
+                    leaf
+                    for leaf in leaves_by_trace_frame[int(frame.id)]
+                    if leaf in filter_leaves
+                ]
             )
+            for frame in branches
+        ]
 
         return branches, leaves_strings
 
@@ -1012,7 +1057,7 @@ details              show additional information about the current trace frame
                 selected_number - 1,
             )
 
-        new_trace_tuples = self._create_trace_tuples(new_navigation)
+        new_trace_tuples = TraceOperator.create_trace_tuples(new_navigation)
 
         if self._is_before_root():
             new_trace_tuples.reverse()
@@ -1256,10 +1301,9 @@ details              show additional information about the current trace frame
     def _output_trace_expansion(
         self, trace_frames: List[TraceFrameQueryResult], leaves_strings: List[str]
     ) -> None:
+        current_branch_index = self._current_branch_index(trace_frames)
         for i, (frame, leaves) in enumerate(zip(trace_frames, leaves_strings)):
-            prefix = (
-                "[*]" if i == self._current_branch_index(trace_frames) else f"[{i + 1}]"
-            )
+            prefix = "[*]" if i == current_branch_index else f"[{i + 1}]"
             print(f"{prefix} {frame.callee} : {frame.callee_port}")
             print(f"{' ' * 8}[{frame.trace_length} hops: {leaves}]")
             print(f"{' ' * 8}[{frame.filename}:{frame.callee_location}]")
@@ -1302,6 +1346,10 @@ details              show additional information about the current trace frame
 
     def _output_trace_tuples(self, trace_tuples):
         expand = "+"
+        callables = [
+            self._get_callable_from_trace_tuple(trace_tuple)
+            for trace_tuple in trace_tuples
+        ]
         max_length_index = len(str(len(trace_tuples) - 1)) + 1
         max_length_split = max(
             max(
@@ -1311,49 +1359,42 @@ details              show additional information about the current trace frame
             len("⎇"),
         )
         max_length_callable = max(
-            max(
-                len(self._get_callable_from_trace_tuple(trace_tuple)[0])
-                for trace_tuple in trace_tuples
-            ),
-            len("[callable]"),
+            max(len(callable) for callable, _ in callables), len("[callable]")
         )
         max_length_condition = max(
-            max(
-                len(self._get_callable_from_trace_tuple(trace_tuple)[1])
-                for trace_tuple in trace_tuples
-            ),
-            len("[port]"),
+            max(len(callable_port) for _, callable_port in callables), len("[port]")
         )
 
-        print(  # table header
+        output = [  # table header
             f"{' ' * 5}"
             f"{'#':{max_length_index}}"
             f"{'⎇':{max_length_split}}"
             f" {'[callable]':{max_length_callable}}"
             f" {'[port]':{max_length_condition}}"
             f" [location]"
-        )
+        ]
 
-        for i, trace_tuple in enumerate(trace_tuples):
+        for i, (trace_tuple, (callable, callable_port)) in enumerate(
+            zip(trace_tuples, callables)
+        ):
             prefix = "-->" if i == self.current_trace_frame_index else " " * 3
             prefix += f" {(i + 1):<{max_length_index}}"
 
             if trace_tuple.missing:
-                print(
+                output.append(
                     f" {prefix}"
                     f" [Missing trace frame: {trace_tuple.trace_frame.callee}:"
                     f"{trace_tuple.trace_frame.callee_port}]"
                 )
                 continue
 
-            callable, callable_port = self._get_callable_from_trace_tuple(trace_tuple)
             branches_string = (
                 f"{expand}"
                 f"{str(trace_tuple.branches):{max_length_split - len(expand)}}"
                 if trace_tuple.branches > 1
                 else " " * max_length_split
             )
-            output_string = (
+            output.append(
                 f" {prefix}"
                 f"{branches_string}"
                 f" {callable:{max_length_callable}}"
@@ -1362,19 +1403,7 @@ details              show additional information about the current trace frame
                 f":{trace_tuple.trace_frame.callee_location}"
             )
 
-            print(output_string)
-
-    def _create_trace_tuples(
-        self, navigation: Iterable[Tuple[TraceFrameQueryResult, int]]
-    ) -> List[TraceTuple]:
-        return [
-            TraceTuple(
-                trace_frame=trace_frame,
-                branches=branches,
-                missing=trace_frame.caller == "",
-            )
-            for trace_frame, branches in navigation
-        ]
+        print("\n".join(output))
 
     def _next_backward_trace_frames(
         self,
@@ -1396,9 +1425,9 @@ details              show additional information about the current trace frame
     def _create_issue_output_string(
         self,
         issue: IssueQueryResult,
-        sources: Set[str],
-        sinks: Set[str],
-        features: Set[str],
+        sources: AbstractSet[str],
+        sinks: AbstractSet[str],
+        features: AbstractSet[str],
     ) -> str:
         sources_output = f"\n{' ' * 18}".join(sources)
         sinks_output = f"\n{' ' * 18}".join(sinks)
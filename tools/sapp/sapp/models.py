@@ -82,6 +82,8 @@ class SourceLocation(object):
     begin_column and we have a single point.
     """
 
+    __slots__ = ["line_no", "begin_column", "end_column"]
+
     def __init__(self, line_no, begin_column, end_column=None):
         self.line_no = line_no
         self.begin_column = begin_column
@@ -105,9 +107,7 @@ class SourceLocation(object):
 
     @staticmethod
     def to_string(location):
-        return "|".join(
-            map(str, [location.line_no, location.begin_column, location.end_column])
-        )
+        return f"{location.line_no}|{location.begin_column}|{location.end_column}"
 
 
 class CaseSensitiveStringType(types.TypeDecorator):
@@ -405,6 +405,8 @@ class IssueInstance(Base, PrepareMixin, MutableRecordMixin):  # noqa
 
     __tablename__ = "issue_instances"
 
+    __table_args__ = (Index("ix_issueinstance_run_issue", "run_id", "issue_id"),)
+
     # pyre-fixme[8]: Attribute has type `DBID`; used as `Column[typing.Any]`.
     id: DBID = Column(BIGDBIDType, primary_key=True)
 
@@ -437,7 +439,7 @@ class IssueInstance(Base, PrepareMixin, MutableRecordMixin):  # noqa
         doc="True if the issue did not exist before this instance",
     )
 
-    run_id = Column(BIGDBIDType, nullable=False, index=True)
+    run_id = Column(BIGDBIDType, nullable=False, index=False)
 
     issue_id = Column(BIGDBIDType, nullable=False, index=True)
 
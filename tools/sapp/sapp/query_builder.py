@@ -79,6 +79,8 @@ class IssueQueryBuilder:
                 else:
                     if not filter_condition:
                         query = query.filter(column is None)
+                    elif filter_type == Filter.codes:
+                        query = query.filter(column.in_(filter_condition))
                     else:
                         query = query.filter(
                             or_(*[column.like(item) for item in filter_condition])
@@ -200,41 +202,13 @@ class IssueQueryBuilder:
     def _get_leaves_issue_instance(
         self, session: Session, issue_instance_id: int, kind: SharedTextKind
     ) -> Set[str]:
-        message_ids = [
-            int(id)
-            for id, in session.query(SharedText.id)
-            .distinct(SharedText.id)
+        return {
+            contents
+            for contents, in session.query(SharedText.contents)
             .join(
                 IssueInstanceSharedTextAssoc,
                 SharedText.id == IssueInstanceSharedTextAssoc.shared_text_id,
             )
             .filter(IssueInstanceSharedTextAssoc.issue_instance_id == issue_instance_id)
             .filter(SharedText.kind == kind)
-        ]
-        return self._leaf_dict_lookups(message_ids, kind, session)
-
-    def _leaf_dict_lookups(
-        self, message_ids: List[int], kind: SharedTextKind, session: Session
-    ) -> Set[str]:
-        if kind == SharedTextKind.SOURCE:
-            leaf_dict = {
-                int(id): contents
-                for id, contents in session.query(
-                    SharedText.id, SharedText.contents
-                ).filter(SharedText.kind == kind)
-            }
-        elif kind == SharedTextKind.SINK:
-            leaf_dict = {
-                int(id): contents
-                for id, contents in session.query(
-                    SharedText.id, SharedText.contents
-                ).filter(SharedText.kind == kind)
-            }
-        else:
-            leaf_dict = {
-                int(id): contents
-                for id, contents in session.query(
-                    SharedText.id, SharedText.contents
-                ).filter(SharedText.kind == kind)
-            }
-        return {leaf_dict[id] for id in message_ids if id in leaf_dict}
+        }
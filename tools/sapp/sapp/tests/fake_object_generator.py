@@ -20,6 +20,10 @@ from ..models import (
 from ..trace_graph import TraceGraph
 
 
+# Fixed timestamp for fixture rows; keeps fixtures deterministic.
+FIXED_NOW = datetime.datetime(2020, 1, 1)
+
+
 class FakeObjectGenerator:
     def __init__(self, graph: Optional[TraceGraph] = None, run_id=0):
         self.reinit(run_id)
@@ -47,7 +51,6 @@ class FakeObjectGenerator:
         code=None,
     ):
         self.handle += 1
-        now = datetime.datetime.now()
         result = Issue.Record(
             id=IssueDBID(),
             handle=str(self.handle) if not handle else handle,
@@ -56,8 +59,8 @@ class FakeObjectGenerator:
             code=code or (6015 + self.handle),
             filename=filename,
             callable=callable,
-            first_seen=now,
-            last_seen=now,
+            first_seen=FIXED_NOW,
+            last_seen=FIXED_NOW,
             line=1,
             start=1,
             end=2,
@@ -154,7 +157,7 @@ class FakeObjectGenerator:
         # Not added to bulksaver or graph
         return Run(
             id=DBID(self.run_id),
-            date=datetime.datetime.now(),
+            date=FIXED_NOW,
             hh_version="1234567890",
             revision_id=12345,
             differential_id=differential_id,
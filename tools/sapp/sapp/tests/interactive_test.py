@@ -1,15 +1,19 @@
 #!/usr/bin/env python3
 
 import os
-import sys
-from datetime import datetime
-from io import StringIO
-from typing import List
+import re
+import sqlite3
+from contextlib import ExitStack, contextmanager, redirect_stderr, redirect_stdout
+from functools import partial
+from typing import Iterator, List, Optional, Set
 from unittest import TestCase
 from unittest.mock import mock_open, patch
 
-from sqlalchemy.orm import Session
+from sqlalchemy import event
+from sqlalchemy.exc import InvalidRequestError
+from sqlalchemy.orm import Query, Session, raiseload
 
+from .. import __name__ as client
 from ..db import DB, DBType
 from ..decorators import UserError
 from ..interactive import (
@@ -35,37 +39,317 @@ from ..models import (
     create as create_models,
 )
 from ..pysa_taint_parser import Parser
-from .fake_object_generator import FakeObjectGenerator
+from ..query_builder import IssueQueryBuilder
+from ..trace_operator import TraceOperator
+from .fake_object_generator import FIXED_NOW, FakeObjectGenerator
 
 
-class InteractiveTest(TestCase):
-    def setUp(self) -> None:
-        self.db = DB(DBType.MEMORY)
-        create_models(self.db)
-        self.interactive = Interactive(
-            database=self.db, repository_directory="", parser_class=Parser
+# Creating the schema dominates the cost of setting up a test, so it is done
+# once per module and every test class starts from a copy of the empty
+# database. Each copy is a private in-memory database, so the classes share no
+# state and can be spread across workers (e.g. `pytest -n auto --dist loadfile`).
+_template_db: Optional[DB] = None
+
+
+def setUpModule() -> None:
+    global _template_db
+    _template_db = _memory_database()
+    create_models(_template_db)
+
+
+def tearDownModule() -> None:
+    global _template_db
+    _template_db = None
+
+
+def _empty_database() -> DB:
+    assert _template_db is not None, "setUpModule has not run"
+    db = _memory_database()
+    _copy_database(_template_db, db)
+    _guard_lazy_loads(db)
+    return db
+
+
+def _memory_database() -> DB:
+    db = DB(DBType.MEMORY)
+    event.listen(db.engine, "connect", _set_test_pragmas)
+    return db
+
+
+def _set_test_pragmas(dbapi_connection, connection_record) -> None:
+    # An in-memory database already keeps its journal in memory, and
+    # `synchronous` does nothing without a file; only temporary tables and
+    # indices (e.g. for ORDER BY) would otherwise go to disk.
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA temp_store = MEMORY")
+    cursor.close()
+
+
+def _copy_database(source: DB, destination: DB) -> None:
+    """Copies an in-memory database page by page with SQLite's backup API."""
+    if not hasattr(sqlite3.Connection, "backup"):  # Python < 3.7
+        create_models(destination)
+        return
+
+    source_connection = source.engine.raw_connection()
+    destination_connection = destination.engine.raw_connection()
+    try:
+        source_connection.connection.backup(destination_connection.connection)
+    finally:
+        destination_connection.close()
+        source_connection.close()
+
+
+class _RaiseLoadQuery(Query):
+    """Makes every lazy load raise, so that a new relationship can't quietly
+    turn an interactive command into one SELECT per row."""
+
+    def __iter__(self):
+        return Query.__iter__(self.options(raiseload("*")))
+
+
+def _guard_lazy_loads(db: DB) -> None:
+    db.make_session_object = partial(db.make_session_object, query_cls=_RaiseLoadQuery)
+
+
+@contextmanager
+def _count_queries(db: DB) -> Iterator[List[str]]:
+    """Collects the SQL statements run against `db` inside the block, leaving
+    out the ping every new session sends, so that the counts don't depend on
+    how many sessions a command opens."""
+    statements: List[str] = []
+
+    def before_cursor_execute(
+        connection, cursor, statement, parameters, context, executemany
+    ) -> None:
+        if statement != "SELECT 1":
+            statements.append(statement)
+
+    event.listen(db.engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(db.engine, "before_cursor_execute", before_cursor_execute)
+
+
+def _list_issues_filter_setup(fakes: FakeObjectGenerator, db: DB) -> None:
+    run = fakes.run()
+
+    issue1 = fakes.issue()
+    fakes.instance(
+        issue_id=issue1.id,
+        callable="module.sub.function1",
+        filename="module/sub.py",
+        min_trace_length_to_sources=1,
+        min_trace_length_to_sinks=1,
+    )
+    fakes.save_all(db)
+
+    issue2 = fakes.issue()
+    fakes.instance(
+        issue_id=issue2.id,
+        callable="module.sub.function2",
+        filename="module/sub.py",
+        min_trace_length_to_sources=2,
+        min_trace_length_to_sinks=2,
+    )
+    fakes.save_all(db)
+
+    issue3 = fakes.issue()
+    fakes.instance(
+        issue_id=issue3.id,
+        callable="module.function3",
+        filename="module/__init__.py",
+        min_trace_length_to_sources=3,
+        min_trace_length_to_sinks=3,
+    )
+    fakes.save_all(db)
+
+    with db.make_session() as session:
+        session.add(run)
+        session.commit()
+
+
+# (kind, caller, caller_port, callee, callee_port, trace_length) of each frame in
+# the branched trace. Frames called from root start the trace at the issue.
+_BRANCHED_TRACE_FRAMES = (
+    (TraceKind.POSTCONDITION, "call1", "root", "leaf", "source", 0),
+    (TraceKind.POSTCONDITION, "call1", "root", "leaf", "source", 1),
+    (TraceKind.PRECONDITION, "call1", "root", "call2", "param2", 2),
+    (TraceKind.PRECONDITION, "call1", "root", "call2", "param2", 3),
+    (TraceKind.PRECONDITION, "call2", "param2", "leaf", "sink", 1),
+    (TraceKind.PRECONDITION, "call2", "param2", "leaf", "sink", 0),
+)
+
+
+def _set_up_branched_trace(fakes: FakeObjectGenerator, db: DB) -> List[TraceFrame]:
+    run = fakes.run()
+    fakes.issue()
+    instance = fakes.instance()
+    source = fakes.source("source1")
+    sink = fakes.sink("sink1")
+    fakes.saver.add_all(
+        [
+            IssueInstanceSharedTextAssoc.Record(
+                issue_instance_id=instance.id, shared_text_id=source.id
+            ),
+            IssueInstanceSharedTextAssoc.Record(
+                issue_instance_id=instance.id, shared_text_id=sink.id
+            ),
+        ]
+    )
+    # Resolved once, rather than branching on the kind for every frame.
+    frame_factories = {
+        TraceKind.POSTCONDITION: (fakes.postcondition, source),
+        TraceKind.PRECONDITION: (fakes.precondition, sink),
+    }
+    frames = []
+    for i, (kind, caller, caller_port, callee, callee_port, trace_length) in enumerate(
+        _BRANCHED_TRACE_FRAMES
+    ):
+        make_frame, leaf = frame_factories[kind]
+        frame = make_frame(
+            caller=caller,
+            caller_port=caller_port,
+            callee=callee,
+            callee_port=callee_port,
+            location=(i, i, i),
         )
-        self.stdout = StringIO()
-        self.stderr = StringIO()
-        sys.stdout = self.stdout  # redirect output
-        sys.stderr = self.stderr  # redirect output
-        self.fakes = FakeObjectGenerator()
+        frames.append(frame)
+        fakes.saver.add(
+            TraceFrameLeafAssoc.Record(
+                trace_frame_id=frame.id, leaf_id=leaf.id, trace_length=trace_length
+            )
+        )
+        if caller_port == "root":
+            fakes.saver.add(
+                IssueInstanceTraceFrameAssoc.Record(
+                    trace_frame_id=frame.id, issue_instance_id=instance.id
+                )
+            )
+
+    fakes.save_all(db)
+
+    with db.make_session() as session:
+        session.add(run)
+        session.commit()
+
+    return frames
+
+
+# Expected trace() output of the branched-trace and prefix-length tests.
+_BRANCHED_TRACE_OUTPUT = [
+    "     # ⎇  [callable]    [port] [location]",
+    "     1 +2 leaf          source lib/server/posts/response.py:0|0|0",
+    " --> 2    Foo.barMethod root   /r/some/filename.py:6|7|8",
+    "     3 +2 call2         param2 lib/server/posts/request.py:2|2|2",
+    "     4 +2 leaf          sink   lib/server/posts/request.py:5|5|5",
+    "",
+]
+_PREFIX_TRACE_OUTPUT = [
+    "     # ⎇  [callable]    [port] [location]",
+    " --> 1 +2 leaf          source lib/server/posts/response.py:4|5|6",
+    "     2    Foo.barMethod root   /r/some/filename.py:6|7|8",
+    "     3    leaf          sink   lib/server/posts/request.py:4|5|6",
+    "",
+]
+_PREFIX_TRACE_OUTPUT_AFTER_BRANCH = [
+    "     # ⎇  [callable]    [port] [location]",
+    "     1    leaf          source lib/server/posts/response.py:4|5|6",
+    " --> 2 +2 prev_call     result lib/server/posts/response.py:4|5|6",
+    "     3    Foo.barMethod root   /r/some/filename.py:6|7|8",
+    "     4    leaf          sink   lib/server/posts/request.py:4|5|6",
+    "",
+]
+
+
+# (cursor moves, branch, max queries, expected output lines) of each step of
+# testBranch, in order: every step starts where the previous one left off.
+_BRANCH_CASES = (
+    # location 0|0|0 -> 1|1|1
+    (0, 2, 2, [" --> 1 +2 leaf          source lib/server/posts/response.py:1|1|1"]),
+    # location 1|1|1 -> 0|0|0
+    (0, 1, 2, [" --> 1 +2 leaf          source lib/server/posts/response.py:0|0|0"]),
+    # location 2|2|2 -> 3|3|3
+    (2, 2, 4, [" --> 3 +2 call2         param2 lib/server/posts/request.py:3|3|3"]),
+    # location 4|4|4 -> 5|5|5
+    (
+        1,
+        2,
+        3,
+        [
+            "     3 +2 call2         param2 lib/server/posts/request.py:3|3|3",
+            " --> 4 +2 leaf          sink   lib/server/posts/request.py:4|4|4",
+        ],
+    ),
+)
+
+
+_ISSUE_HEADER = re.compile(r"Issue \d+")
+
+
+class _CapturedOutput:
+    """Write-only stream that collects chunks and joins them on read.
+
+    Cheaper than `StringIO` for the many small writes the trace and branch
+    commands emit."""
+
+    def __init__(self) -> None:
+        self.chunks: List[str] = []
+
+    def write(self, text: str) -> int:
+        self.chunks.append(text)
+        return len(text)
 
-    def tearDown(self) -> None:
-        sys.stdout = sys.__stdout__  # reset redirect
-        sys.stderr = sys.__stderr__  # reset redirect
+    def flush(self) -> None:
+        pass
+
+    def isatty(self) -> bool:
+        return False
+
+    def getvalue(self) -> str:
+        return "".join(self.chunks)
+
+    def clear(self) -> None:
+        self.chunks.clear()
+
+
+class _OutputCaptureTestCase(TestCase):
+    def setUp(self) -> None:
+        self.stdout = _CapturedOutput()
+        self.stderr = _CapturedOutput()
+        with ExitStack() as stack:
+            stack.enter_context(redirect_stdout(self.stdout))
+            stack.enter_context(redirect_stderr(self.stderr))
+            self.addCleanup(stack.pop_all().close)
 
     def _clear_stdout(self):
-        self.stdout = StringIO()
-        sys.stdout = self.stdout
+        self.stdout.clear()
+
+    def _output_lines(self) -> Set[str]:
+        return set(self.stdout.getvalue().splitlines())
+
+    def _listed_issues(self) -> Set[str]:
+        # Full issue ids, so that "Issue 1" does not also match "Issue 10".
+        return set(_ISSUE_HEADER.findall(self.stdout.getvalue()))
 
-    def _add_to_session(self, session, data):
-        if not isinstance(data, list):
-            session.add(data)
-            return
 
-        for row in data:
-            session.add(row)
+class InteractiveTest(_OutputCaptureTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.db = _empty_database()
+        self.interactive = Interactive(
+            database=self.db, repository_directory="", parser_class=Parser
+        )
+        self.fakes = FakeObjectGenerator()
+
+    @contextmanager
+    def _transaction(self, **kwargs) -> Iterator[Session]:
+        """Commits everything added in the block at once, or nothing if it
+        raises. SQLAlchemy 1.3 has no `with session.begin()` for this."""
+        with self.db.make_session(**kwargs) as session:
+            yield session
+            session.commit()
 
     def _frame_to_query_result(
         self, session: Session, trace_frame: TraceFrame
@@ -102,8 +386,8 @@ class InteractiveTest(TestCase):
         self.interactive.current_run_id = 1
         self.interactive.current_issue_instance_id = 2
         self.interactive.current_frame_id = 3
-        self.interactive.sources = {1}
-        self.interactive.sinks = {2}
+        self.interactive.sources = frozenset({1})
+        self.interactive.sinks = frozenset({2})
 
         self.interactive.state()
         output = self.stdout.getvalue()
@@ -123,9 +407,8 @@ class InteractiveTest(TestCase):
         )
         self.fakes.save_all(self.db)
 
-        with self.db.make_session() as session:
+        with self._transaction() as session:
             session.add(run)
-            session.commit()
 
         self.interactive.setup()
         self.interactive.issues()
@@ -147,219 +430,97 @@ class InteractiveTest(TestCase):
         self.fakes.instance()  # part of run2
         self.fakes.save_all(self.db)
 
-        with self.db.make_session() as session:
+        with self._transaction() as session:
             session.add(run1)
             session.add(run2)
-            session.commit()
 
         self.interactive.setup()
         self.interactive.issues()
-        output = self.stdout.getvalue().strip()
+        output = self._listed_issues()
 
         self.assertNotIn("Issue 1", output)
         self.assertIn("Issue 2", output)
 
-    def _list_issues_filter_setup(self):
-        run = self.fakes.run()
-
-        issue1 = self.fakes.issue()
-        self.fakes.instance(
-            issue_id=issue1.id,
-            callable="module.sub.function1",
-            filename="module/sub.py",
-            min_trace_length_to_sources=1,
-            min_trace_length_to_sinks=1,
-        )
-        self.fakes.save_all(self.db)
+    def testListIssuesFilterAllFeature(self):
+        _list_issues_filter_setup(self.fakes, self.db)
 
-        issue2 = self.fakes.issue()
-        self.fakes.instance(
-            issue_id=issue2.id,
-            callable="module.sub.function2",
-            filename="module/sub.py",
-            min_trace_length_to_sources=2,
-            min_trace_length_to_sinks=2,
-        )
-        self.fakes.save_all(self.db)
+        self.fakes.instance()
+        feature1 = self.fakes.feature("via:feature1")
+        feature2 = self.fakes.feature("via:feature2")
+        self.fakes.feature("via:feature3")
 
-        issue3 = self.fakes.issue()
-        self.fakes.instance(
-            issue_id=issue3.id,
-            callable="module.function3",
-            filename="module/__init__.py",
-            min_trace_length_to_sources=3,
-            min_trace_length_to_sinks=3,
-        )
         self.fakes.save_all(self.db)
 
-        with self.db.make_session() as session:
-            session.add(run)
-            session.commit()
+        assocs = [
+            {"feature_id": feature1.id, "issue_instance_id": 1},
+            {"feature_id": feature2.id, "issue_instance_id": 1},
+        ]
 
-    def testListIssuesFilterCodes(self):
-        self._list_issues_filter_setup()
+        with self._transaction() as session:
+            session.execute(IssueInstanceSharedTextAssoc.__table__.insert(), assocs)
 
         self.interactive.setup()
-        self.interactive.issues(codes="a string")
-        stderr = self.stderr.getvalue().strip()
-        self.assertIn("'codes' should be", stderr)
 
-        self.interactive.issues(codes=6016)
-        output = self.stdout.getvalue().strip()
+        self.interactive.issues(all_features="via:feature1")
+        output = self._listed_issues()
         self.assertIn("Issue 1", output)
-        self.assertNotIn("Issue 2", output)
-        self.assertNotIn("Issue 3", output)
 
         self._clear_stdout()
-        self.interactive.issues(codes=[6017, 6018])
-        output = self.stdout.getvalue().strip()
-        self.assertNotIn("Issue 1", output)
-        self.assertIn("Issue 2", output)
-        self.assertIn("Issue 3", output)
-
-    def testListIssuesFilterCallables(self):
-        self._list_issues_filter_setup()
-
-        self.interactive.setup()
-        self.interactive.issues(callables=1234)
-        stderr = self.stderr.getvalue().strip()
-        self.assertIn("'callables' should be", stderr)
-
-        self.interactive.issues(callables="%sub%")
-        output = self.stdout.getvalue().strip()
+        self.interactive.issues(all_features=["via:feature1", "via:feature2"])
+        output = self._listed_issues()
         self.assertIn("Issue 1", output)
-        self.assertIn("Issue 2", output)
-        self.assertNotIn("Issue 3", output)
 
         self._clear_stdout()
-        self.interactive.issues(callables=["%function3"])
-        output = self.stdout.getvalue().strip()
+        self.interactive.issues(all_features=["via:feature3"])
+        output = self._listed_issues()
         self.assertNotIn("Issue 1", output)
-        self.assertNotIn("Issue 2", output)
-        self.assertIn("Issue 3", output)
-
-    def testListIssuesFilterFilenames(self):
-        self._list_issues_filter_setup()
-
-        self.interactive.setup()
-        self.interactive.issues(filenames=1234)
-        stderr = self.stderr.getvalue().strip()
-        self.assertIn("'filenames' should be", stderr)
-
-        self.interactive.issues(filenames="module/s%")
-        output = self.stdout.getvalue().strip()
-        self.assertIn("Issue 1", output)
-        self.assertIn("Issue 2", output)
-        self.assertNotIn("Issue 3", output)
 
         self._clear_stdout()
-        self.interactive.issues(filenames=["%__init__.py"])
-        output = self.stdout.getvalue().strip()
+        self.interactive.issues(all_features=["via:feature1", "via:feature3"])
+        output = self._listed_issues()
         self.assertNotIn("Issue 1", output)
-        self.assertNotIn("Issue 2", output)
-        self.assertIn("Issue 3", output)
-
-    def testListIssuesFilterMinTraceLength(self):
-        self._list_issues_filter_setup()
-
-        self.interactive.setup()
-
-        self.interactive.issues(exact_trace_length_to_sources="1")
-        stderr = self.stderr.getvalue().strip()
-        self.assertIn("'exact_trace_length_to_sources' should be", stderr)
-        self._clear_stdout()
-
-        self.interactive.issues(exact_trace_length_to_sinks="1")
-        stderr = self.stderr.getvalue().strip()
-        self.assertIn("'exact_trace_length_to_sinks' should be", stderr)
-        self._clear_stdout()
 
-        self.interactive.issues(max_trace_length_to_sources="1")
-        stderr = self.stderr.getvalue().strip()
-        self.assertIn("'max_trace_length_to_sources' should be", stderr)
-        self._clear_stdout()
+    def testListIssuesFilterAnyFeature(self):
+        _list_issues_filter_setup(self.fakes, self.db)
 
-        self.interactive.issues(max_trace_length_to_sinks="1")
-        stderr = self.stderr.getvalue().strip()
-        self.assertIn("'max_trace_length_to_sinks' should be", stderr)
-        self._clear_stdout()
+        self.fakes.instance()
+        feature1 = self.fakes.feature("via:feature1")
+        feature2 = self.fakes.feature("via:feature2")
+        self.fakes.feature("via:feature3")
 
-        self.interactive.issues(
-            exact_trace_length_to_sources=1, max_trace_length_to_sources=1
-        )
-        stderr = self.stderr.getvalue().strip()
-        self.assertIn("can't be set together", stderr)
-        self._clear_stdout()
+        self.fakes.save_all(self.db)
 
-        self.interactive.issues(
-            exact_trace_length_to_sinks=1, max_trace_length_to_sinks=1
-        )
-        stderr = self.stderr.getvalue().strip()
-        self.assertIn("can't be set together", stderr)
-        self._clear_stdout()
+        assocs = [
+            {"feature_id": feature1.id, "issue_instance_id": 1},
+            {"feature_id": feature2.id, "issue_instance_id": 1},
+        ]
 
-        self.interactive.issues(exact_trace_length_to_sources=1)
-        output = self.stdout.getvalue().strip()
-        self.assertIn("Issue 1", output)
-        self.assertNotIn("Issue 2", output)
-        self.assertNotIn("Issue 3", output)
-        self._clear_stdout()
+        with self._transaction() as session:
+            session.execute(IssueInstanceSharedTextAssoc.__table__.insert(), assocs)
 
-        self.interactive.issues(exact_trace_length_to_sinks=1)
-        output = self.stdout.getvalue().strip()
-        self.assertIn("Issue 1", output)
-        self.assertNotIn("Issue 2", output)
-        self.assertNotIn("Issue 3", output)
-        self._clear_stdout()
+        self.interactive.setup()
 
-        self.interactive.issues(max_trace_length_to_sources=1)
-        output = self.stdout.getvalue().strip()
+        self.interactive.issues(any_features="via:feature1")
+        output = self._listed_issues()
         self.assertIn("Issue 1", output)
-        self.assertNotIn("Issue 2", output)
-        self.assertNotIn("Issue 3", output)
-        self._clear_stdout()
 
-        self.interactive.issues(max_trace_length_to_sinks=1)
-        output = self.stdout.getvalue().strip()
-        self.assertIn("Issue 1", output)
-        self.assertNotIn("Issue 2", output)
-        self.assertNotIn("Issue 3", output)
         self._clear_stdout()
-
-        self.interactive.issues(max_trace_length_to_sources=2)
-        output = self.stdout.getvalue().strip()
+        self.interactive.issues(any_features=["via:feature1", "via:feature2"])
+        output = self._listed_issues()
         self.assertIn("Issue 1", output)
-        self.assertIn("Issue 2", output)
-        self.assertNotIn("Issue 3", output)
-        self._clear_stdout()
 
-        self.interactive.issues(max_trace_length_to_sinks=2)
-        output = self.stdout.getvalue().strip()
-        self.assertIn("Issue 1", output)
-        self.assertIn("Issue 2", output)
-        self.assertNotIn("Issue 3", output)
         self._clear_stdout()
-
-        self.interactive.issues(
-            max_trace_length_to_sources=1, max_trace_length_to_sinks=1
-        )
-        output = self.stdout.getvalue().strip()
+        self.interactive.issues(any_features=["via:feature1", "via:feature3"])
+        output = self._listed_issues()
         self.assertIn("Issue 1", output)
-        self.assertNotIn("Issue 2", output)
-        self.assertNotIn("Issue 3", output)
-        self._clear_stdout()
 
-        self.interactive.issues(
-            max_trace_length_to_sources=1, max_trace_length_to_sinks=2
-        )
-        output = self.stdout.getvalue().strip()
-        self.assertIn("Issue 1", output)
-        self.assertNotIn("Issue 2", output)
-        self.assertNotIn("Issue 3", output)
         self._clear_stdout()
+        self.interactive.issues(any_features=["via:feature3"])
+        output = self._listed_issues()
+        self.assertNotIn("Issue 1", output)
 
-    def testListIssuesFilterAllFeature(self):
-        self._list_issues_filter_setup()
+    def testListIssuesFilterExcludeFeature(self):
+        _list_issues_filter_setup(self.fakes, self.db)
 
         self.fakes.instance()
         feature1 = self.fakes.feature("via:feature1")
@@ -369,180 +530,108 @@ class InteractiveTest(TestCase):
         self.fakes.save_all(self.db)
 
         assocs = [
-            IssueInstanceSharedTextAssoc(
-                shared_text_id=feature1.id, issue_instance_id=1
-            ),
-            IssueInstanceSharedTextAssoc(
-                shared_text_id=feature2.id, issue_instance_id=1
-            ),
+            {"feature_id": feature1.id, "issue_instance_id": 1},
+            {"feature_id": feature2.id, "issue_instance_id": 1},
         ]
 
-        with self.db.make_session() as session:
-            self._add_to_session(session, assocs)
-            session.commit()
-            self.interactive.setup()
+        with self._transaction() as session:
+            session.execute(IssueInstanceSharedTextAssoc.__table__.insert(), assocs)
 
-            self.interactive.issues(all_features="via:feature1")
-            output = self.stdout.getvalue().strip()
-            self.assertIn("Issue 1", output)
+        self.interactive.setup()
 
-            self._clear_stdout()
-            self.interactive.issues(all_features=["via:feature1", "via:feature2"])
-            output = self.stdout.getvalue().strip()
-            self.assertIn("Issue 1", output)
+        self.interactive.issues(exclude_features="via:feature1")
+        output = self._listed_issues()
+        self.assertNotIn("Issue 1", output)
 
-            self._clear_stdout()
-            self.interactive.issues(all_features=["via:feature3"])
-            output = self.stdout.getvalue().strip()
-            self.assertNotIn("Issue 1", output)
+        self._clear_stdout()
+        self.interactive.issues(exclude_features=["via:feature1", "via:feature2"])
+        output = self._listed_issues()
+        self.assertNotIn("Issue 1", output)
 
-            self._clear_stdout()
-            self.interactive.issues(all_features=["via:feature1", "via:feature3"])
-            output = self.stdout.getvalue().strip()
-            self.assertNotIn("Issue 1", output)
+        self._clear_stdout()
+        self.interactive.issues(exclude_features=["via:feature1", "via:feature3"])
+        output = self._listed_issues()
+        self.assertNotIn("Issue 1", output)
 
-    def testListIssuesFilterAnyFeature(self):
-        self._list_issues_filter_setup()
+        self._clear_stdout()
+        self.interactive.issues(exclude_features=["via:feature3"])
+        output = self._listed_issues()
+        self.assertIn("Issue 1", output)
+
+    def testListIssuesFilterAllFeatureAndAnyFeature(self):
+        _list_issues_filter_setup(self.fakes, self.db)
 
-        self.fakes.instance()
         feature1 = self.fakes.feature("via:feature1")
         feature2 = self.fakes.feature("via:feature2")
-        self.fakes.feature("via:feature3")
+        feature3 = self.fakes.feature("via:feature3")
 
         self.fakes.save_all(self.db)
 
-        assocs = [
-            IssueInstanceSharedTextAssoc(
-                shared_text_id=feature1.id, issue_instance_id=1
-            ),
-            IssueInstanceSharedTextAssoc(
-                shared_text_id=feature2.id, issue_instance_id=1
-            ),
-        ]
+        with self._transaction() as session:
+            session.execute(
+                IssueInstanceSharedTextAssoc.__table__.insert(),
+                [
+                    {"feature_id": feature1.id, "issue_instance_id": 1},
+                    {"feature_id": feature2.id, "issue_instance_id": 1},
+                    {"feature_id": feature3.id, "issue_instance_id": 1},
+                    {"feature_id": feature1.id, "issue_instance_id": 2},
+                    {"feature_id": feature2.id, "issue_instance_id": 2},
+                ],
+            )
 
-        with self.db.make_session() as session:
-            self._add_to_session(session, assocs)
-            session.commit()
-            self.interactive.setup()
+        self.interactive.setup()
 
-            self.interactive.issues(any_features="via:feature1")
-            output = self.stdout.getvalue().strip()
-            self.assertIn("Issue 1", output)
+        self.interactive.issues(
+            any_features=["via:feature2", "via:feature3"], all_features="via:feature1",
+        )
+        output = self._listed_issues()
+        self.assertIn("Issue 1", output)
+        self.assertIn("Issue 2", output)
 
-            self._clear_stdout()
-            self.interactive.issues(any_features=["via:feature1", "via:feature2"])
-            output = self.stdout.getvalue().strip()
-            self.assertIn("Issue 1", output)
+    def testListIssuesCachesRepeatedQueries(self):
+        _list_issues_filter_setup(self.fakes, self.db)
 
-            self._clear_stdout()
-            self.interactive.issues(any_features=["via:feature1", "via:feature3"])
-            output = self.stdout.getvalue().strip()
-            self.assertIn("Issue 1", output)
+        with patch.object(
+            IssueQueryBuilder, "get", autospec=True, side_effect=IssueQueryBuilder.get
+        ) as get:
+            self.interactive.setup()
+            self.interactive.issues(codes=[6016, 6017])
+            self.interactive.issues(codes=[6016, 6017])
+            self.assertEqual(get.call_count, 1)
+            self.assertEqual(self._listed_issues(), {"Issue 1", "Issue 2"})
 
-            self._clear_stdout()
-            self.interactive.issues(any_features=["via:feature3"])
-            output = self.stdout.getvalue().strip()
-            self.assertNotIn("Issue 1", output)
+            self.interactive.issues(codes=6016)
+            self.interactive.issues(codes=6016)
+            self.assertEqual(get.call_count, 2)
 
-    def testListIssuesFilterExcludeFeature(self):
-        self._list_issues_filter_setup()
-
-        self.fakes.instance()
-        feature1 = self.fakes.feature("via:feature1")
-        feature2 = self.fakes.feature("via:feature2")
-        self.fakes.feature("via:feature3")
-
-        self.fakes.save_all(self.db)
-
-        assocs = [
-            IssueInstanceSharedTextAssoc(
-                shared_text_id=feature1.id, issue_instance_id=1
-            ),
-            IssueInstanceSharedTextAssoc(
-                shared_text_id=feature2.id, issue_instance_id=1
-            ),
-        ]
-
-        with self.db.make_session() as session:
-            self._add_to_session(session, assocs)
-            session.commit()
-            self.interactive.setup()
-
-            self.interactive.issues(exclude_features="via:feature1")
-            output = self.stdout.getvalue().strip()
-            self.assertNotIn("Issue 1", output)
-
-            self._clear_stdout()
-            self.interactive.issues(exclude_features=["via:feature1", "via:feature2"])
-            output = self.stdout.getvalue().strip()
-            self.assertNotIn("Issue 1", output)
-
-            self._clear_stdout()
-            self.interactive.issues(exclude_features=["via:feature1", "via:feature3"])
-            output = self.stdout.getvalue().strip()
-            self.assertNotIn("Issue 1", output)
-
-            self._clear_stdout()
-            self.interactive.issues(exclude_features=["via:feature3"])
-            output = self.stdout.getvalue().strip()
-            self.assertIn("Issue 1", output)
-
-    def testListIssuesFilterAllFeatureAndAnyFeature(self):
-        self._list_issues_filter_setup()
-
-        feature1 = self.fakes.feature("via:feature1")
-        feature2 = self.fakes.feature("via:feature2")
-        feature3 = self.fakes.feature("via:feature3")
-
-        self.fakes.save_all(self.db)
+            # Only the last listing is kept.
+            self.interactive.issues(codes=[6016, 6017])
+            self.assertEqual(get.call_count, 3)
 
-        with self.db.make_session() as session:
-            self._add_to_session(
-                session,
-                [
-                    IssueInstanceSharedTextAssoc(
-                        shared_text_id=feature1.id, issue_instance_id=1
-                    ),
-                    IssueInstanceSharedTextAssoc(
-                        shared_text_id=feature2.id, issue_instance_id=1
-                    ),
-                    IssueInstanceSharedTextAssoc(
-                        shared_text_id=feature3.id, issue_instance_id=1
-                    ),
-                    IssueInstanceSharedTextAssoc(
-                        shared_text_id=feature1.id, issue_instance_id=2
-                    ),
-                    IssueInstanceSharedTextAssoc(
-                        shared_text_id=feature2.id, issue_instance_id=2
-                    ),
-                ],
-            )
-            session.commit()
             self.interactive.setup()
-
-            self.interactive.issues(
-                any_features=["via:feature2", "via:feature3"],
-                all_features="via:feature1",
-            )
-            output = self.stdout.getvalue().strip()
-            self.assertIn("Issue 1", output)
-            self.assertIn("Issue 2", output)
+            self.interactive.issues(codes=[6016, 6017])
+            self.assertEqual(get.call_count, 4)
 
     def testNoRunsFound(self):
         self.interactive.setup()
         stderr = self.stderr.getvalue().strip()
         self.assertIn("No runs found.", stderr)
 
+    def testSetupCreatesModelsOnce(self):
+        with patch(f"{client}.interactive.create_models") as create_models_mock:
+            self.interactive.setup()
+            self.interactive.setup()
+        create_models_mock.assert_called_once_with(self.db)
+
     def testListRuns(self):
         runs = [
-            Run(id=1, date=datetime.now(), status=RunStatus.FINISHED),
-            Run(id=2, date=datetime.now(), status=RunStatus.INCOMPLETE),
-            Run(id=3, date=datetime.now(), status=RunStatus.FINISHED),
+            {"id": 1, "date": FIXED_NOW, "status": RunStatus.FINISHED},
+            {"id": 2, "date": FIXED_NOW, "status": RunStatus.INCOMPLETE},
+            {"id": 3, "date": FIXED_NOW, "status": RunStatus.FINISHED},
         ]
 
-        with self.db.make_session() as session:
-            self._add_to_session(session, runs)
-            session.commit()
+        with self._transaction() as session:
+            session.execute(Run.__table__.insert(), runs)
 
         self.interactive.setup()
         self.interactive.runs()
@@ -562,28 +651,26 @@ class InteractiveTest(TestCase):
         self.fakes.instance(message="Issue message")
         self.fakes.save_all(self.db)
 
-        with self.db.make_session() as session:
+        with self._transaction() as session:
             session.add(run1)
             session.add(run2)
-            session.commit()
 
         self.interactive.setup()
         self.interactive.run(1)
         self.interactive.issues()
-        output = self.stdout.getvalue().strip()
+        output = self._listed_issues()
 
         self.assertIn("Issue 1", output)
         self.assertNotIn("Issue 2", output)
 
     def testSetRunNonExistent(self):
         runs = [
-            Run(id=1, date=datetime.now(), status=RunStatus.FINISHED),
-            Run(id=2, date=datetime.now(), status=RunStatus.INCOMPLETE),
+            {"id": 1, "date": FIXED_NOW, "status": RunStatus.FINISHED},
+            {"id": 2, "date": FIXED_NOW, "status": RunStatus.INCOMPLETE},
         ]
 
-        with self.db.make_session() as session:
-            self._add_to_session(session, runs)
-            session.commit()
+        with self._transaction() as session:
+            session.execute(Run.__table__.insert(), runs)
 
         self.interactive.setup()
         self.interactive.run(2)
@@ -595,17 +682,16 @@ class InteractiveTest(TestCase):
 
     def testSetLatestRun(self):
         runs = [
-            Run(id=1, date=datetime.now(), status=RunStatus.FINISHED, kind="a"),
-            Run(id=2, date=datetime.now(), status=RunStatus.FINISHED, kind="a"),
-            Run(id=3, date=datetime.now(), status=RunStatus.FINISHED, kind="a"),
-            Run(id=4, date=datetime.now(), status=RunStatus.FINISHED, kind="b"),
-            Run(id=5, date=datetime.now(), status=RunStatus.FINISHED, kind="b"),
-            Run(id=6, date=datetime.now(), status=RunStatus.FINISHED, kind="c"),
+            {"id": 1, "date": FIXED_NOW, "status": RunStatus.FINISHED, "kind": "a"},
+            {"id": 2, "date": FIXED_NOW, "status": RunStatus.FINISHED, "kind": "a"},
+            {"id": 3, "date": FIXED_NOW, "status": RunStatus.FINISHED, "kind": "a"},
+            {"id": 4, "date": FIXED_NOW, "status": RunStatus.FINISHED, "kind": "b"},
+            {"id": 5, "date": FIXED_NOW, "status": RunStatus.FINISHED, "kind": "b"},
+            {"id": 6, "date": FIXED_NOW, "status": RunStatus.FINISHED, "kind": "c"},
         ]
 
-        with self.db.make_session() as session:
-            self._add_to_session(session, runs)
-            session.commit()
+        with self._transaction() as session:
+            session.execute(Run.__table__.insert(), runs)
 
         self.interactive.latest_run("c")
         self.assertEqual(self.interactive.current_run_id, 6)
@@ -628,9 +714,8 @@ class InteractiveTest(TestCase):
         self.fakes.instance(message="Issue message")
         self.fakes.save_all(self.db)
 
-        with self.db.make_session() as session:
+        with self._transaction() as session:
             session.add(run)
-            session.commit()
 
         self.interactive.setup()
 
@@ -650,9 +735,8 @@ class InteractiveTest(TestCase):
     def testSetIssueNonExistent(self):
         run = self.fakes.run()
 
-        with self.db.make_session() as session:
+        with self._transaction() as session:
             session.add(run)
-            session.commit()
 
         self.interactive.setup()
         self.interactive.issue(1)
@@ -670,10 +754,9 @@ class InteractiveTest(TestCase):
         self.fakes.instance()
         self.fakes.save_all(self.db)
 
-        with self.db.make_session() as session:
+        with self._transaction() as session:
             session.add(run1)
             session.add(run2)
-            session.commit()
 
         self.interactive.setup()
         self.assertEqual(int(self.interactive.current_run_id), 2)
@@ -687,18 +770,14 @@ class InteractiveTest(TestCase):
         self.fakes.source("source3")
         self.fakes.save_all(self.db)
         assocs = [
-            IssueInstanceSharedTextAssoc(
-                shared_text_id=source1.id, issue_instance_id=1
-            ),
-            IssueInstanceSharedTextAssoc(
-                shared_text_id=source2.id, issue_instance_id=1
-            ),
+            {"feature_id": source1.id, "issue_instance_id": 1},
+            {"feature_id": source2.id, "issue_instance_id": 1},
         ]
 
-        with self.db.make_session() as session:
-            self._add_to_session(session, assocs)
-            session.commit()
+        with self._transaction() as session:
+            session.execute(IssueInstanceSharedTextAssoc.__table__.insert(), assocs)
 
+        with self.db.make_session() as session:
             self.interactive.setup()
             sources = self.interactive._get_leaves_issue_instance(
                 session, 1, SharedTextKind.SOURCE
@@ -715,14 +794,14 @@ class InteractiveTest(TestCase):
         self.fakes.sink("sink3")
         self.fakes.save_all(self.db)
         assocs = [
-            IssueInstanceSharedTextAssoc(shared_text_id=sink1.id, issue_instance_id=1),
-            IssueInstanceSharedTextAssoc(shared_text_id=sink2.id, issue_instance_id=1),
+            {"feature_id": sink1.id, "issue_instance_id": 1},
+            {"feature_id": sink2.id, "issue_instance_id": 1},
         ]
 
-        with self.db.make_session() as session:
-            self._add_to_session(session, assocs)
-            session.commit()
+        with self._transaction() as session:
+            session.execute(IssueInstanceSharedTextAssoc.__table__.insert(), assocs)
 
+        with self.db.make_session() as session:
             self.interactive.setup()
             sinks = self.interactive._get_leaves_issue_instance(
                 session, 1, SharedTextKind.SINK
@@ -739,18 +818,14 @@ class InteractiveTest(TestCase):
         self.fakes.feature("via:feature3")
         self.fakes.save_all(self.db)
         assocs = [
-            IssueInstanceSharedTextAssoc(
-                shared_text_id=feature1.id, issue_instance_id=1
-            ),
-            IssueInstanceSharedTextAssoc(
-                shared_text_id=feature2.id, issue_instance_id=1
-            ),
+            {"feature_id": feature1.id, "issue_instance_id": 1},
+            {"feature_id": feature2.id, "issue_instance_id": 1},
         ]
 
-        with self.db.make_session() as session:
-            self._add_to_session(session, assocs)
-            session.commit()
+        with self._transaction() as session:
+            session.execute(IssueInstanceSharedTextAssoc.__table__.insert(), assocs)
 
+        with self.db.make_session() as session:
             self.interactive.setup()
             features = self.interactive._get_leaves_issue_instance(
                 session, 1, SharedTextKind.FEATURE
@@ -760,22 +835,26 @@ class InteractiveTest(TestCase):
         self.assertIn("via:feature1", features)
         self.assertIn("via:feature2", features)
 
+    _BASIC_TRACE_FRAMES = (
+        {
+            "caller": "call1",
+            "caller_port": "root",
+            "callee": "call2",
+            "callee_port": "param0",
+            "location": (1, 1, 1),
+        },
+        {
+            "caller": "call2",
+            "caller_port": "param0",
+            "callee": "leaf",
+            "callee_port": "sink",
+            "location": (1, 2, 1),
+        },
+    )
+
     def _basic_trace_frames(self):
         return [
-            self.fakes.precondition(
-                caller="call1",
-                caller_port="root",
-                callee="call2",
-                callee_port="param0",
-                location=(1, 1, 1),
-            ),
-            self.fakes.precondition(
-                caller="call2",
-                caller_port="param0",
-                callee="leaf",
-                callee_port="sink",
-                location=(1, 2, 1),
-            ),
+            self.fakes.precondition(**kwargs) for kwargs in self._BASIC_TRACE_FRAMES
         ]
 
     def testNextTraceFramesBackwards(self):
@@ -809,12 +888,12 @@ class InteractiveTest(TestCase):
         )
         self.fakes.save_all(self.db)
 
-        with self.db.make_session() as session:
+        with self._transaction() as session:
             session.add(run)
-            session.commit()
 
+        with self.db.make_session() as session:
             self.interactive.setup()
-            self.interactive.sinks = {"sink1"}
+            self.interactive.sinks = frozenset({"sink1"})
             next_frames = self.interactive._next_backward_trace_frames(
                 session, frames[1], set()
             )
@@ -861,7 +940,7 @@ class InteractiveTest(TestCase):
                 3,
             ),
         ]
-        trace_tuples = self.interactive._create_trace_tuples(postcondition_traces)
+        trace_tuples = TraceOperator.create_trace_tuples(postcondition_traces)
         self.assertEqual(len(trace_tuples), 3)
         self.assertEqual(
             trace_tuples,
@@ -1033,9 +1112,8 @@ class InteractiveTest(TestCase):
 
         self.fakes.save_all(self.db)
 
-        with self.db.make_session() as session:
+        with self._transaction() as session:
             session.add(run)
-            session.commit()
 
         self.interactive.setup()
         self.interactive.trace()
@@ -1072,9 +1150,8 @@ class InteractiveTest(TestCase):
         )
         self.fakes.save_all(self.db)
 
-        with self.db.make_session() as session:
+        with self._transaction() as session:
             session.add(run)
-            session.commit()
 
         self.interactive.setup()
         self.interactive.frame(int(frames[0].id))
@@ -1136,9 +1213,8 @@ class InteractiveTest(TestCase):
         )
         self.fakes.save_all(self.db)
 
-        with self.db.make_session() as session:
+        with self._transaction() as session:
             session.add(run)
-            session.commit()
 
         self.interactive.setup()
         self.interactive.issue(1)
@@ -1189,9 +1265,8 @@ class InteractiveTest(TestCase):
         )
         self.fakes.save_all(self.db)
 
-        with self.db.make_session() as session:
+        with self._transaction() as session:
             session.add(run)
-            session.commit()
 
         self.interactive.setup()
 
@@ -1249,9 +1324,8 @@ class InteractiveTest(TestCase):
 
         self.fakes.save_all(self.db)
 
-        with self.db.make_session() as session:
+        with self._transaction() as session:
             session.add(run)
-            session.commit()
 
         self.interactive.setup()
         self.interactive.issue(1)
@@ -1290,12 +1364,11 @@ class InteractiveTest(TestCase):
 
         self.fakes.save_all(self.db)
 
-        with self.db.make_session() as session:
+        with self._transaction() as session:
             session.add(run)
-            session.commit()
 
         self.interactive.setup()
-        self.interactive.sources = {"source1"}
+        self.interactive.sources = frozenset({"source1"})
         self.interactive.issue(1)
         self._clear_stdout()
         self.interactive.trace()
@@ -1309,12 +1382,32 @@ class InteractiveTest(TestCase):
             ],
         )
 
-    def _set_up_branched_trace(self) -> List[TraceFrame]:
+    def testBranchPrefixLengthChanges(self):
         run = self.fakes.run()
         self.fakes.issue()
         instance = self.fakes.instance()
         source = self.fakes.source("source1")
         sink = self.fakes.sink("sink1")
+        frames = [
+            self.fakes.postcondition(
+                caller="call1", caller_port="root", callee="leaf", callee_port="source"
+            ),
+            self.fakes.postcondition(
+                caller="call1",
+                caller_port="root",
+                callee="prev_call",
+                callee_port="result",
+            ),
+            self.fakes.postcondition(
+                caller="prev_call",
+                caller_port="result",
+                callee="leaf",
+                callee_port="source",
+            ),
+            self.fakes.precondition(
+                caller="call1", caller_port="root", callee="leaf", callee_port="sink"
+            ),
+        ]
         self.fakes.saver.add_all(
             [
                 IssueInstanceSharedTextAssoc.Record(
@@ -1325,354 +1418,75 @@ class InteractiveTest(TestCase):
                 ),
             ]
         )
-        frames = []
-        for i in range(6):
-            if i < 2:  # 2 postconditions
-                frames.append(
-                    self.fakes.postcondition(
-                        caller="call1",
-                        caller_port="root",
-                        callee="leaf",
-                        callee_port="source",
-                        location=(i, i, i),
-                    )
-                )
-                self.fakes.saver.add(
-                    TraceFrameLeafAssoc.Record(
-                        trace_frame_id=frames[-1].id, leaf_id=source.id, trace_length=i
-                    )
-                )
-                self.fakes.saver.add(
-                    IssueInstanceTraceFrameAssoc.Record(
-                        trace_frame_id=frames[-1].id, issue_instance_id=instance.id
-                    )
-                )
-            elif i < 4:
-                frames.append(
-                    self.fakes.precondition(
-                        caller="call1",
-                        caller_port="root",
-                        callee="call2",
-                        callee_port="param2",
-                        location=(i, i, i),
-                    )
-                )
-                self.fakes.saver.add(
-                    TraceFrameLeafAssoc.Record(
-                        trace_frame_id=frames[-1].id, leaf_id=sink.id, trace_length=i
-                    )
-                )
-                self.fakes.saver.add(
-                    IssueInstanceTraceFrameAssoc.Record(
-                        trace_frame_id=frames[-1].id, issue_instance_id=instance.id
-                    )
-                )
-            else:
-                frames.append(
-                    self.fakes.precondition(
-                        caller="call2",
-                        caller_port="param2",
-                        callee="leaf",
-                        callee_port="sink",
-                        location=(i, i, i),
-                    )
-                )
-                self.fakes.saver.add(
-                    TraceFrameLeafAssoc.Record(
-                        trace_frame_id=frames[-1].id,
-                        leaf_id=sink.id,
-                        trace_length=5 - i,
-                    )
-                )
+        self.fakes.saver.add_all(
+            [
+                IssueInstanceTraceFrameAssoc.Record(
+                    issue_instance_id=instance.id, trace_frame_id=frames[0].id
+                ),
+                IssueInstanceTraceFrameAssoc.Record(
+                    issue_instance_id=instance.id, trace_frame_id=frames[1].id
+                ),
+                IssueInstanceTraceFrameAssoc.Record(
+                    issue_instance_id=instance.id, trace_frame_id=frames[3].id
+                ),
+            ]
+        )
+        self.fakes.saver.add_all(
+            [
+                TraceFrameLeafAssoc.Record(
+                    trace_frame_id=frames[0].id, leaf_id=source.id, trace_length=0
+                ),
+                TraceFrameLeafAssoc.Record(
+                    trace_frame_id=frames[1].id, leaf_id=source.id, trace_length=1
+                ),
+                TraceFrameLeafAssoc.Record(
+                    trace_frame_id=frames[2].id, leaf_id=source.id, trace_length=0
+                ),
+                TraceFrameLeafAssoc.Record(
+                    trace_frame_id=frames[3].id, leaf_id=sink.id, trace_length=0
+                ),
+            ]
+        )
 
         self.fakes.save_all(self.db)
 
-        with self.db.make_session() as session:
+        with self._transaction() as session:
             session.add(run)
-            session.commit()
-
-        return frames
-
-    def testTraceBranchNumber(self):
-        self._set_up_branched_trace()
 
         self.interactive.setup()
         self.interactive.issue(1)
 
-        self.assertEqual(self.interactive.sources, {"source1"})
-        self.assertEqual(self.interactive.sinks, {"sink1"})
-
         self._clear_stdout()
-        self.interactive.trace()
-        self.assertEqual(
-            self.stdout.getvalue().split("\n"),
-            [
-                "     # ⎇  [callable]    [port] [location]",
-                "     1 +2 leaf          source lib/server/posts/response.py:0|0|0",
-                " --> 2    Foo.barMethod root   /r/some/filename.py:6|7|8",
-                "     3 +2 call2         param2 lib/server/posts/request.py:2|2|2",
-                "     4 +2 leaf          sink   lib/server/posts/request.py:5|5|5",
-                "",
-            ],
-        )
-
-    def testShowBranches(self):
-        self._set_up_branched_trace()
-
-        self.interactive.setup()
-        self.interactive.issue(1)
-        # Parent at root
         self.interactive.prev_cursor_location()
-        with patch("click.prompt", return_value=0):
-            self.interactive.branch()
-        output = self.stdout.getvalue().strip()
-        self.assertIn(
-            "[*] leaf : source\n"
-            "        [0 hops: source1]\n"
-            "        [lib/server/posts/response.py:0|0|0]",
-            output,
-        )
-        self.assertIn(
-            "[2] leaf : source\n"
-            "        [1 hops: source1]\n"
-            "        [lib/server/posts/response.py:1|1|1]",
-            output,
-        )
+        self.assertEqual(self.stdout.getvalue().split("\n"), _PREFIX_TRACE_OUTPUT)
 
         self._clear_stdout()
-        # Move to call2:param2
-        self.interactive.next_cursor_location()
-        self.interactive.next_cursor_location()
-        with patch("click.prompt", return_value=0):
-            self.interactive.branch()
-        output = self.stdout.getvalue().strip()
-        self.assertIn(
-            "[*] call2 : param2\n"
-            "        [2 hops: sink1]\n"
-            "        [lib/server/posts/request.py:2|2|2]",
-            output,
-        )
-        self.assertIn(
-            "[2] call2 : param2\n"
-            "        [3 hops: sink1]\n"
-            "        [lib/server/posts/request.py:3|3|3]",
-            output,
+        self.interactive.branch(2)
+        self.assertEqual(
+            self.stdout.getvalue().split("\n"), _PREFIX_TRACE_OUTPUT_AFTER_BRANCH
         )
 
         self._clear_stdout()
-        # Move to leaf:sink
-        self.interactive.next_cursor_location()
         with patch("click.prompt", return_value=0):
             self.interactive.branch()
-        output = self.stdout.getvalue().strip()
-        self.assertIn(
-            "[*] leaf : sink\n"
-            "        [0 hops: sink1]\n"
-            "        [lib/server/posts/request.py:5|5|5]",
-            output,
-        )
-        self.assertIn(
-            "[2] leaf : sink\n"
-            "        [1 hops: sink1]\n"
-            "        [lib/server/posts/request.py:4|4|4]",
-            output,
-        )
+        output = self._output_lines()
+        self.assertIn("[*] prev_call : result", output)
+        self.assertIn("        [1 hops: source1]", output)
 
-    def testGetTraceFrameBranches(self):
-        frames = self._set_up_branched_trace()
+    def testCurrentBranchIndex(self):
+        trace_frames = [TraceFrame(id=1), TraceFrame(id=2), TraceFrame(id=3)]
 
-        self.interactive.setup()
-        self.interactive.issue(1)
-        # Parent at root
-        self.interactive.prev_cursor_location()
+        self.interactive.current_trace_frame_index = 0
+        self.interactive.trace_tuples = [TraceTuple(trace_frame=TraceFrame(id=1))]
 
-        with self.db.make_session() as session:
-            branches = self.interactive._get_trace_frame_branches(session)
-            self.assertEqual(len(branches), 2)
-            self.assertEqual(int(branches[0].id), int(frames[0].id))
-            self.assertEqual(int(branches[1].id), int(frames[1].id))
+        self.assertEqual(0, self.interactive._current_branch_index(trace_frames))
+        self.interactive.trace_tuples[0].trace_frame.id = 2
+        self.assertEqual(1, self.interactive._current_branch_index(trace_frames))
+        self.interactive.trace_tuples[0].trace_frame.id = 3
+        self.assertEqual(2, self.interactive._current_branch_index(trace_frames))
 
-            # Parent is no longer root
-            self.interactive.next_cursor_location()
-            self.interactive.next_cursor_location()
-            self.interactive.next_cursor_location()
-
-            branches = self.interactive._get_trace_frame_branches(session)
-            self.assertEqual(len(branches), 2)
-            self.assertEqual(int(branches[0].id), int(frames[5].id))
-            self.assertEqual(int(branches[1].id), int(frames[4].id))
-
-    def testBranch(self):
-        self._set_up_branched_trace()
-
-        self.interactive.setup()
-        self.interactive.issue(1)
-        self.interactive.prev_cursor_location()
-
-        # We are testing for the source location, which differs between branches
-        self._clear_stdout()
-        self.interactive.branch(2)  # location 0|0|0 -> 1|1|1
-        output = self.stdout.getvalue().strip()
-        self.assertIn(
-            " --> 1 +2 leaf          source lib/server/posts/response.py:1|1|1", output
-        )
-
-        self._clear_stdout()
-        self.interactive.branch(1)  # location 1|1|1 -> 0|0|0
-        output = self.stdout.getvalue().strip()
-        self.assertIn(
-            " --> 1 +2 leaf          source lib/server/posts/response.py:0|0|0", output
-        )
-
-        self.interactive.next_cursor_location()
-        self.interactive.next_cursor_location()
-
-        self._clear_stdout()
-        self.interactive.branch(2)  # location 2|2|2 -> 3|3|3
-        output = self.stdout.getvalue().strip()
-        self.assertIn(
-            " --> 3 +2 call2         param2 lib/server/posts/request.py:3|3|3", output
-        )
-
-        self.interactive.next_cursor_location()
-
-        self._clear_stdout()
-        self.interactive.branch(2)  # location 4|4|4 -> 5|5|5
-        output = self.stdout.getvalue().strip()
-        self.assertIn(
-            "     3 +2 call2         param2 lib/server/posts/request.py:3|3|3", output
-        )
-        self.assertIn(
-            " --> 4 +2 leaf          sink   lib/server/posts/request.py:4|4|4", output
-        )
-
-        self.interactive.branch(3)  # location 4|4|4 -> 5|5|5
-        stderr = self.stderr.getvalue().strip()
-        self.assertIn("Branch number invalid", stderr)
-
-    def testBranchPrefixLengthChanges(self):
-        run = self.fakes.run()
-        self.fakes.issue()
-        instance = self.fakes.instance()
-        source = self.fakes.source("source1")
-        sink = self.fakes.sink("sink1")
-        frames = [
-            self.fakes.postcondition(
-                caller="call1", caller_port="root", callee="leaf", callee_port="source"
-            ),
-            self.fakes.postcondition(
-                caller="call1",
-                caller_port="root",
-                callee="prev_call",
-                callee_port="result",
-            ),
-            self.fakes.postcondition(
-                caller="prev_call",
-                caller_port="result",
-                callee="leaf",
-                callee_port="source",
-            ),
-            self.fakes.precondition(
-                caller="call1", caller_port="root", callee="leaf", callee_port="sink"
-            ),
-        ]
-        self.fakes.saver.add_all(
-            [
-                IssueInstanceSharedTextAssoc.Record(
-                    issue_instance_id=instance.id, shared_text_id=source.id
-                ),
-                IssueInstanceSharedTextAssoc.Record(
-                    issue_instance_id=instance.id, shared_text_id=sink.id
-                ),
-            ]
-        )
-        self.fakes.saver.add_all(
-            [
-                IssueInstanceTraceFrameAssoc.Record(
-                    issue_instance_id=instance.id, trace_frame_id=frames[0].id
-                ),
-                IssueInstanceTraceFrameAssoc.Record(
-                    issue_instance_id=instance.id, trace_frame_id=frames[1].id
-                ),
-                IssueInstanceTraceFrameAssoc.Record(
-                    issue_instance_id=instance.id, trace_frame_id=frames[3].id
-                ),
-            ]
-        )
-        self.fakes.saver.add_all(
-            [
-                TraceFrameLeafAssoc.Record(
-                    trace_frame_id=frames[0].id, leaf_id=source.id, trace_length=0
-                ),
-                TraceFrameLeafAssoc.Record(
-                    trace_frame_id=frames[1].id, leaf_id=source.id, trace_length=1
-                ),
-                TraceFrameLeafAssoc.Record(
-                    trace_frame_id=frames[2].id, leaf_id=source.id, trace_length=0
-                ),
-                TraceFrameLeafAssoc.Record(
-                    trace_frame_id=frames[3].id, leaf_id=sink.id, trace_length=0
-                ),
-            ]
-        )
-
-        self.fakes.save_all(self.db)
-
-        with self.db.make_session() as session:
-            session.add(run)
-            session.commit()
-
-        self.interactive.setup()
-        self.interactive.issue(1)
-
-        self._clear_stdout()
-        self.interactive.prev_cursor_location()
-        self.assertEqual(
-            self.stdout.getvalue().split("\n"),
-            [
-                "     # ⎇  [callable]    [port] [location]",
-                " --> 1 +2 leaf          source lib/server/posts/response.py:4|5|6",
-                "     2    Foo.barMethod root   /r/some/filename.py:6|7|8",
-                "     3    leaf          sink   lib/server/posts/request.py:4|5|6",
-                "",
-            ],
-        )
-
-        self._clear_stdout()
-        self.interactive.branch(2)
-        self.assertEqual(
-            self.stdout.getvalue().split("\n"),
-            [
-                "     # ⎇  [callable]    [port] [location]",
-                "     1    leaf          source lib/server/posts/response.py:4|5|6",
-                " --> 2 +2 prev_call     result lib/server/posts/response.py:4|5|6",
-                "     3    Foo.barMethod root   /r/some/filename.py:6|7|8",
-                "     4    leaf          sink   lib/server/posts/request.py:4|5|6",
-                "",
-            ],
-        )
-
-        self._clear_stdout()
-        with patch("click.prompt", return_value=0):
-            self.interactive.branch()
-        output = self.stdout.getvalue().strip()
-        self.assertIn("[*] prev_call : result", output)
-        self.assertIn("        [1 hops: source1]", output)
-
-    def testCurrentBranchIndex(self):
-        trace_frames = [TraceFrame(id=1), TraceFrame(id=2), TraceFrame(id=3)]
-
-        self.interactive.current_trace_frame_index = 0
-        self.interactive.trace_tuples = [TraceTuple(trace_frame=TraceFrame(id=1))]
-
-        self.assertEqual(0, self.interactive._current_branch_index(trace_frames))
-        self.interactive.trace_tuples[0].trace_frame.id = 2
-        self.assertEqual(1, self.interactive._current_branch_index(trace_frames))
-        self.interactive.trace_tuples[0].trace_frame.id = 3
-        self.assertEqual(2, self.interactive._current_branch_index(trace_frames))
-
-        self.interactive.trace_tuples[0].trace_frame.id = 4
-        self.assertEqual(-1, self.interactive._current_branch_index(trace_frames))
+        self.interactive.trace_tuples[0].trace_frame.id = 4
+        self.assertEqual(-1, self.interactive._current_branch_index(trace_frames))
 
     def testVerifyEntrypointSelected(self):
         self.interactive.current_issue_instance_id = -1
@@ -1725,16 +1539,16 @@ class InteractiveTest(TestCase):
 
     def testAddListOrStringFilterToQuery(self):
         shared_texts = [
-            SharedText(id=1, contents="prefix"),
-            SharedText(id=2, contents="suffix"),
-            SharedText(id=3, contents="prefix_suffix"),
-            SharedText(id=4, contents="fix"),
+            {"id": 1, "contents": "prefix"},
+            {"id": 2, "contents": "suffix"},
+            {"id": 3, "contents": "prefix_suffix"},
+            {"id": 4, "contents": "fix"},
         ]
 
-        with self.db.make_session() as session:
-            self._add_to_session(session, shared_texts)
-            session.commit()
+        with self._transaction() as session:
+            session.execute(SharedText.__table__.insert(), shared_texts)
 
+        with self.db.make_session() as session:
             query = session.query(SharedText.contents)
             self.assertEqual(
                 self.interactive._add_list_or_string_filter_to_query(
@@ -2032,9 +1846,8 @@ else:
         frames = self._basic_trace_frames()
         self.fakes.save_all(self.db)
 
-        with self.db.make_session() as session:
+        with self._transaction() as session:
             session.add(run)
-            session.commit()
 
         self.interactive.current_run_id = 1
         self._clear_stdout()
@@ -2061,27 +1874,6 @@ else:
             ],
         )
 
-    def testListFramesWithLimit(self):
-        frames = self._set_up_branched_trace()
-        self.interactive.run(1)
-
-        self._clear_stdout()
-        self.interactive.frames(limit=3)
-        self.assertEqual(
-            self.stdout.getvalue().split("\n"),
-            [
-                "[id] [caller:caller_port -> callee:callee_port]",
-                "---- call1:root ->",
-                f"{frames[3].id}        call2:param2",
-                f"{frames[2].id}        call2:param2",
-                f"{frames[1].id}        leaf:source",
-                "...",
-                "Showing 3/6 matching frames. To see more, call 'frames' with "
-                "the 'limit' argument.",
-                "",
-            ],
-        )
-
     def testSetFrame(self):
         frames = self._basic_trace_frames()
         sink = self.fakes.sink("sink")
@@ -2144,10 +1936,9 @@ else:
         )
         self.fakes.save_all(self.db)
 
-        with self.db.make_session() as session:
+        with self._transaction() as session:
             session.add(run1)
             session.add(run2)
-            session.commit()
 
         self.interactive.setup()
         self.assertEqual(int(self.interactive.current_run_id), 2)
@@ -2173,54 +1964,6 @@ else:
         trace_tuple = TraceTuple(trace_frame=TraceFrame(callee_port="not_root"))
         self.assertFalse(self.interactive._is_root_trace_tuple(trace_tuple))
 
-    def testParents(self):
-        self._set_up_branched_trace()
-        self.interactive.setup()
-
-        self.interactive.frame(3)
-        self.interactive.current_trace_frame_index = 1
-
-        self._clear_stdout()
-        with patch("click.prompt", return_value=0):
-            self.interactive.parents()
-        self.assertEqual(
-            self.stdout.getvalue().split("\n"),
-            ["[1] call1 : root", "[2] call1 : root", ""],
-        )
-
-        self._clear_stdout()
-        self.interactive.current_trace_frame_index = 0
-        self.interactive.parents()
-        self.assertIn("No parents calling", self.stdout.getvalue())
-
-        self.interactive.current_trace_frame_index = 2
-        self.interactive.parents()
-        self.assertIn("Try running from a non-leaf node", self.stderr.getvalue())
-
-    def testParentsSelectParent(self):
-        self._set_up_branched_trace()
-        self.interactive.setup()
-
-        self.interactive.frame(3)
-        self.interactive.current_trace_frame_index = 1
-
-        self._clear_stdout()
-        with patch("click.prompt", return_value=1):
-            self.interactive.parents()
-        self.assertEqual(
-            self.stdout.getvalue().split("\n"),
-            [
-                "[1] call1 : root",
-                "[2] call1 : root",
-                "",
-                "     # ⎇  [callable] [port] [location]",
-                " --> 1    call1      root   lib/server/posts/request.py:2|2|2",
-                "     2    call2      param2 lib/server/posts/request.py:2|2|2",
-                "     3 +2 leaf       sink   lib/server/posts/request.py:5|5|5",
-                "",
-            ],
-        )
-
     def testUpdateTraceTuplesNewParent(self):
         frames = [
             self.fakes.postcondition(callee="A"),
@@ -2298,16 +2041,16 @@ else:
 
     def testAllLeavesByKind(self):
         shared_texts = [
-            SharedText(id=1, contents="source1", kind=SharedTextKind.SOURCE),
-            SharedText(id=2, contents="source2", kind=SharedTextKind.SOURCE),
-            SharedText(id=3, contents="source3", kind=SharedTextKind.SOURCE),
-            SharedText(id=4, contents="sink4", kind=SharedTextKind.SINK),
-            SharedText(id=5, contents="sink5", kind=SharedTextKind.SINK),
+            {"id": 1, "contents": "source1", "kind": SharedTextKind.SOURCE},
+            {"id": 2, "contents": "source2", "kind": SharedTextKind.SOURCE},
+            {"id": 3, "contents": "source3", "kind": SharedTextKind.SOURCE},
+            {"id": 4, "contents": "sink4", "kind": SharedTextKind.SINK},
+            {"id": 5, "contents": "sink5", "kind": SharedTextKind.SINK},
         ]
-        with self.db.make_session() as session:
-            self._add_to_session(session, shared_texts)
-            session.commit()
+        with self._transaction() as session:
+            session.execute(SharedText.__table__.insert(), shared_texts)
 
+        with self.db.make_session() as session:
             self.assertEqual(
                 self.interactive._all_leaves_by_kind(session, SharedTextKind.SOURCE),
                 {1: "source1", 2: "source2", 3: "source3"},
@@ -2341,9 +2084,8 @@ else:
         self.fakes.instance(issue_id=issues[2].id, callable="call2"),
         self.fakes.save_all(self.db)
 
-        with self.db.make_session(expire_on_commit=False) as session:
+        with self._transaction(expire_on_commit=False) as session:
             session.add(run)
-            session.commit()
 
         self.interactive.setup()
         with self.db.make_session() as session:
@@ -2387,9 +2129,8 @@ else:
         self.fakes.instance()
         self.fakes.save_all(self.db)
 
-        with self.db.make_session() as session:
+        with self._transaction() as session:
             session.add(run)
-            session.commit()
 
         # Default is no pager in tests
         self.pager_calls = 0
@@ -2405,3 +2146,404 @@ else:
             self.interactive.issues(use_pager=True)
             self.interactive.runs(use_pager=True)
         self.assertEqual(self.pager_calls, 2)
+
+
+class InteractiveListIssuesFilterTest(_OutputCaptureTestCase):
+    """The filter tests only read from the database, so they share one fixture."""
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.db = _empty_database()
+        _list_issues_filter_setup(FakeObjectGenerator(), cls.db)
+        cls.interactive = Interactive(
+            database=cls.db, repository_directory="", parser_class=Parser
+        )
+        with redirect_stdout(_CapturedOutput()):
+            cls.interactive.setup()
+
+    def setUp(self) -> None:
+        super().setUp()
+        # issues() keeps its last listing; make every test run its own query.
+        self.interactive.last_issue_strings = None
+
+    def testListIssuesFilterCodes(self):
+        self.interactive.issues(codes="a string")
+        stderr = self.stderr.getvalue().strip()
+        self.assertIn("'codes' should be", stderr)
+
+        self.interactive.issues(codes=6016)
+        output = self._listed_issues()
+        self.assertIn("Issue 1", output)
+        self.assertNotIn("Issue 2", output)
+        self.assertNotIn("Issue 3", output)
+
+        self._clear_stdout()
+        self.interactive.issues(codes=[6017, 6018])
+        output = self._listed_issues()
+        self.assertNotIn("Issue 1", output)
+        self.assertIn("Issue 2", output)
+        self.assertIn("Issue 3", output)
+
+    def testListIssuesFilterCallables(self):
+        self.interactive.issues(callables=1234)
+        stderr = self.stderr.getvalue().strip()
+        self.assertIn("'callables' should be", stderr)
+
+        self.interactive.issues(callables="%sub%")
+        output = self._listed_issues()
+        self.assertIn("Issue 1", output)
+        self.assertIn("Issue 2", output)
+        self.assertNotIn("Issue 3", output)
+
+        self._clear_stdout()
+        self.interactive.issues(callables=["%function3"])
+        output = self._listed_issues()
+        self.assertNotIn("Issue 1", output)
+        self.assertNotIn("Issue 2", output)
+        self.assertIn("Issue 3", output)
+
+    def testListIssuesFilterFilenames(self):
+        self.interactive.issues(filenames=1234)
+        stderr = self.stderr.getvalue().strip()
+        self.assertIn("'filenames' should be", stderr)
+
+        self.interactive.issues(filenames="module/s%")
+        output = self._listed_issues()
+        self.assertIn("Issue 1", output)
+        self.assertIn("Issue 2", output)
+        self.assertNotIn("Issue 3", output)
+
+        self._clear_stdout()
+        self.interactive.issues(filenames=["%__init__.py"])
+        output = self._listed_issues()
+        self.assertNotIn("Issue 1", output)
+        self.assertNotIn("Issue 2", output)
+        self.assertIn("Issue 3", output)
+
+    def testListIssuesFilterMinTraceLength(self):
+        self.interactive.issues(exact_trace_length_to_sources="1")
+        stderr = self.stderr.getvalue().strip()
+        self.assertIn("'exact_trace_length_to_sources' should be", stderr)
+        self._clear_stdout()
+
+        self.interactive.issues(exact_trace_length_to_sinks="1")
+        stderr = self.stderr.getvalue().strip()
+        self.assertIn("'exact_trace_length_to_sinks' should be", stderr)
+        self._clear_stdout()
+
+        self.interactive.issues(max_trace_length_to_sources="1")
+        stderr = self.stderr.getvalue().strip()
+        self.assertIn("'max_trace_length_to_sources' should be", stderr)
+        self._clear_stdout()
+
+        self.interactive.issues(max_trace_length_to_sinks="1")
+        stderr = self.stderr.getvalue().strip()
+        self.assertIn("'max_trace_length_to_sinks' should be", stderr)
+        self._clear_stdout()
+
+        self.interactive.issues(
+            exact_trace_length_to_sources=1, max_trace_length_to_sources=1
+        )
+        stderr = self.stderr.getvalue().strip()
+        self.assertIn("can't be set together", stderr)
+        self._clear_stdout()
+
+        self.interactive.issues(
+            exact_trace_length_to_sinks=1, max_trace_length_to_sinks=1
+        )
+        stderr = self.stderr.getvalue().strip()
+        self.assertIn("can't be set together", stderr)
+        self._clear_stdout()
+
+        self.interactive.issues(exact_trace_length_to_sources=1)
+        output = self._listed_issues()
+        self.assertIn("Issue 1", output)
+        self.assertNotIn("Issue 2", output)
+        self.assertNotIn("Issue 3", output)
+        self._clear_stdout()
+
+        self.interactive.issues(exact_trace_length_to_sinks=1)
+        output = self._listed_issues()
+        self.assertIn("Issue 1", output)
+        self.assertNotIn("Issue 2", output)
+        self.assertNotIn("Issue 3", output)
+        self._clear_stdout()
+
+        self.interactive.issues(max_trace_length_to_sources=1)
+        output = self._listed_issues()
+        self.assertIn("Issue 1", output)
+        self.assertNotIn("Issue 2", output)
+        self.assertNotIn("Issue 3", output)
+        self._clear_stdout()
+
+        self.interactive.issues(max_trace_length_to_sinks=1)
+        output = self._listed_issues()
+        self.assertIn("Issue 1", output)
+        self.assertNotIn("Issue 2", output)
+        self.assertNotIn("Issue 3", output)
+        self._clear_stdout()
+
+        self.interactive.issues(max_trace_length_to_sources=2)
+        output = self._listed_issues()
+        self.assertIn("Issue 1", output)
+        self.assertIn("Issue 2", output)
+        self.assertNotIn("Issue 3", output)
+        self._clear_stdout()
+
+        self.interactive.issues(max_trace_length_to_sinks=2)
+        output = self._listed_issues()
+        self.assertIn("Issue 1", output)
+        self.assertIn("Issue 2", output)
+        self.assertNotIn("Issue 3", output)
+        self._clear_stdout()
+
+        self.interactive.issues(
+            max_trace_length_to_sources=1, max_trace_length_to_sinks=1
+        )
+        output = self._listed_issues()
+        self.assertIn("Issue 1", output)
+        self.assertNotIn("Issue 2", output)
+        self.assertNotIn("Issue 3", output)
+        self._clear_stdout()
+
+        self.interactive.issues(
+            max_trace_length_to_sources=1, max_trace_length_to_sinks=2
+        )
+        output = self._listed_issues()
+        self.assertIn("Issue 1", output)
+        self.assertNotIn("Issue 2", output)
+        self.assertNotIn("Issue 3", output)
+        self._clear_stdout()
+
+
+class InteractiveBranchedTraceTest(_OutputCaptureTestCase):
+    """These tests only read from the database, so they share one branched
+    trace. Each test still gets a fresh Interactive."""
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.db = _empty_database()
+        cls.frames = _set_up_branched_trace(FakeObjectGenerator(), cls.db)
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.interactive = Interactive(
+            database=self.db, repository_directory="", parser_class=Parser
+        )
+
+    def testNoLazyLoadRegression(self):
+        frames = self.frames
+
+        with self.db.make_session() as session:
+            instance = session.query(IssueInstance).first()
+            with self.assertRaises(InvalidRequestError):
+                instance.issue
+
+        self.interactive.setup()
+        self.interactive.runs()
+        self.interactive.issues()
+        self.interactive.issue(1)
+        self.interactive.show()
+        self.interactive.trace()
+        self.interactive.next_cursor_location()
+        self.interactive.branch(2)
+        self.interactive.frames()
+        self.interactive.frame(int(frames[0].id))
+        self.interactive.details()
+        self.assertNotIn("Traceback", self.stderr.getvalue())
+
+    def testTraceBranchNumber(self):
+        self.interactive.setup()
+        with _count_queries(self.db) as queries:
+            self.interactive.issue(1)
+        self.assertLessEqual(len(queries), 10)
+
+        self.assertEqual(self.interactive.sources, {"source1"})
+        self.assertEqual(self.interactive.sinks, {"sink1"})
+
+        self._clear_stdout()
+        with _count_queries(self.db) as queries:
+            self.interactive.trace()
+        # issue() already built the trace; trace() only renders it.
+        self.assertEqual(len(queries), 0)
+        self.assertEqual(self.stdout.getvalue().split("\n"), _BRANCHED_TRACE_OUTPUT)
+
+    def testShowBranches(self):
+        self.interactive.setup()
+        self.interactive.issue(1)
+        # Parent at root
+        self.interactive.prev_cursor_location()
+        with patch("click.prompt", return_value=0):
+            self.interactive.branch()
+        output = self.stdout.getvalue().strip()
+        self.assertIn(
+            "[*] leaf : source\n"
+            "        [0 hops: source1]\n"
+            "        [lib/server/posts/response.py:0|0|0]",
+            output,
+        )
+        self.assertIn(
+            "[2] leaf : source\n"
+            "        [1 hops: source1]\n"
+            "        [lib/server/posts/response.py:1|1|1]",
+            output,
+        )
+
+        self._clear_stdout()
+        # Move to call2:param2
+        self.interactive.next_cursor_location()
+        self.interactive.next_cursor_location()
+        with patch("click.prompt", return_value=0):
+            self.interactive.branch()
+        output = self.stdout.getvalue().strip()
+        self.assertIn(
+            "[*] call2 : param2\n"
+            "        [2 hops: sink1]\n"
+            "        [lib/server/posts/request.py:2|2|2]",
+            output,
+        )
+        self.assertIn(
+            "[2] call2 : param2\n"
+            "        [3 hops: sink1]\n"
+            "        [lib/server/posts/request.py:3|3|3]",
+            output,
+        )
+
+        self._clear_stdout()
+        # Move to leaf:sink
+        self.interactive.next_cursor_location()
+        with patch("click.prompt", return_value=0):
+            self.interactive.branch()
+        output = self.stdout.getvalue().strip()
+        self.assertIn(
+            "[*] leaf : sink\n"
+            "        [0 hops: sink1]\n"
+            "        [lib/server/posts/request.py:5|5|5]",
+            output,
+        )
+        self.assertIn(
+            "[2] leaf : sink\n"
+            "        [1 hops: sink1]\n"
+            "        [lib/server/posts/request.py:4|4|4]",
+            output,
+        )
+
+    def testGetTraceFrameBranches(self):
+        frames = self.frames
+
+        self.interactive.setup()
+        self.interactive.issue(1)
+        # Parent at root
+        self.interactive.prev_cursor_location()
+
+        with self.db.make_session() as session:
+            with _count_queries(self.db) as queries:
+                branches = self.interactive._get_trace_frame_branches(session)
+            self.assertLessEqual(len(queries), 1)
+            self.assertEqual(len(branches), 2)
+            self.assertEqual(int(branches[0].id), int(frames[0].id))
+            self.assertEqual(int(branches[1].id), int(frames[1].id))
+
+            # Parent is no longer root
+            self.interactive.next_cursor_location()
+            self.interactive.next_cursor_location()
+            self.interactive.next_cursor_location()
+
+            with _count_queries(self.db) as queries:
+                branches = self.interactive._get_trace_frame_branches(session)
+            self.assertLessEqual(len(queries), 2)
+            self.assertEqual(len(branches), 2)
+            self.assertEqual(int(branches[0].id), int(frames[5].id))
+            self.assertEqual(int(branches[1].id), int(frames[4].id))
+
+    def testBranch(self):
+        self.interactive.setup()
+        self.interactive.issue(1)
+        self.interactive.prev_cursor_location()
+
+        # We are testing for the source location, which differs between branches
+        # Each step starts from the cursor the previous one left, so stop at the
+        # first failure rather than reporting every later step as well.
+        for step, case in enumerate(_BRANCH_CASES):
+            cursor_moves, branch, max_queries, expected_lines = case
+            message = f"step {step}: branch({branch})"
+            for _ in range(cursor_moves):
+                self.interactive.next_cursor_location()
+            self._clear_stdout()
+            with _count_queries(self.db) as queries:
+                self.interactive.branch(branch)
+            self.assertLessEqual(len(queries), max_queries, message)
+            output = self._output_lines()
+            for line in expected_lines:
+                self.assertIn(line, output, message)
+
+        self.interactive.branch(3)  # location 4|4|4 -> 5|5|5
+        stderr = self.stderr.getvalue().strip()
+        self.assertIn("Branch number invalid", stderr)
+
+    def testListFramesWithLimit(self):
+        frames = self.frames
+        self.interactive.run(1)
+
+        self._clear_stdout()
+        self.interactive.frames(limit=3)
+        self.assertEqual(
+            self.stdout.getvalue().split("\n"),
+            [
+                "[id] [caller:caller_port -> callee:callee_port]",
+                "---- call1:root ->",
+                f"{frames[3].id}        call2:param2",
+                f"{frames[2].id}        call2:param2",
+                f"{frames[1].id}        leaf:source",
+                "...",
+                "Showing 3/6 matching frames. To see more, call 'frames' with "
+                "the 'limit' argument.",
+                "",
+            ],
+        )
+
+    def testParents(self):
+        self.interactive.setup()
+
+        self.interactive.frame(3)
+        self.interactive.current_trace_frame_index = 1
+
+        self._clear_stdout()
+        with patch("click.prompt", return_value=0):
+            self.interactive.parents()
+        self.assertEqual(
+            self.stdout.getvalue().split("\n"),
+            ["[1] call1 : root", "[2] call1 : root", ""],
+        )
+
+        self._clear_stdout()
+        self.interactive.current_trace_frame_index = 0
+        self.interactive.parents()
+        self.assertIn("No parents calling", self.stdout.getvalue())
+
+        self.interactive.current_trace_frame_index = 2
+        self.interactive.parents()
+        self.assertIn("Try running from a non-leaf node", self.stderr.getvalue())
+
+    def testParentsSelectParent(self):
+        self.interactive.setup()
+
+        self.interactive.frame(3)
+        self.interactive.current_trace_frame_index = 1
+
+        self._clear_stdout()
+        with patch("click.prompt", return_value=1):
+            self.interactive.parents()
+        self.assertEqual(
+            self.stdout.getvalue().split("\n"),
+            [
+                "[1] call1 : root",
+                "[2] call1 : root",
+                "",
+                "     # ⎇  [callable] [port] [location]",
+                " --> 1    call1      root   lib/server/posts/request.py:2|2|2",
+                "     2    call2      param2 lib/server/posts/request.py:2|2|2",
+                "     3 +2 leaf       sink   lib/server/posts/request.py:5|5|5",
+                "",
+            ],
+        )
@@ -198,6 +198,24 @@ class QueryBuilderTest(TestCase):
             self.assertNotIn(2, issue_ids)
             self.assertIn(3, issue_ids)
 
+    def testFileNameFilterIsCaseInsensitive(self) -> None:
+        with self.db.make_session() as session:
+            builder = IssueQueryBuilder(1).with_session(session)
+            issue_ids = {
+                int(issue.id)
+                for issue in builder.where_file_names_is_any_of(["MODULE/s%"]).get()
+            }
+            self.assertEqual(issue_ids, {1, 2})
+
+    def testRunIssueLookupUsesCompositeIndex(self) -> None:
+        with self.db.make_session() as session:
+            plan = session.execute(
+                "EXPLAIN QUERY PLAN SELECT issue_id FROM issue_instances "
+                "WHERE run_id = :run_id",
+                {"run_id": 1},
+            ).fetchall()
+            self.assertIn("COVERING INDEX ix_issueinstance_run_issue", plan[0][-1])
+
     def testWhereTraceLength(self) -> None:
         with self.db.make_session() as session:
             latest_run_id = (
@@ -271,3 +271,40 @@ class TraceOperatorTest(TestCase):
                 [int(frame.id) for frame, _branches in result],
                 [int(frame.id) for frame in frames],
             )
+
+    def testGetLeavesTraceFrames(self) -> None:
+        frames = self._basic_trace_frames()
+        sink1 = self.fakes.sink("sink1")
+        sink2 = self.fakes.sink("sink2")
+        source = self.fakes.source("source1")
+        self.fakes.saver.add_all(
+            [
+                TraceFrameLeafAssoc.Record(
+                    trace_frame_id=frames[0].id, leaf_id=sink1.id, trace_length=1
+                ),
+                TraceFrameLeafAssoc.Record(
+                    trace_frame_id=frames[0].id, leaf_id=sink2.id, trace_length=1
+                ),
+                TraceFrameLeafAssoc.Record(
+                    trace_frame_id=frames[1].id, leaf_id=source.id, trace_length=0
+                ),
+            ]
+        )
+        self.fakes.save_all(self.db)
+
+        with self.db.make_session() as session:
+            leaf_dicts = (
+                self._all_leaves_by_kind(session, SharedTextKind.SOURCE),
+                self._all_leaves_by_kind(session, SharedTextKind.SINK),
+                self._all_leaves_by_kind(session, SharedTextKind.FEATURE),
+            )
+
+            self.assertEqual(
+                TraceOperator.get_leaves_trace_frames(
+                    leaf_dicts,
+                    session,
+                    [int(frames[0].id), int(frames[1].id)],
+                    SharedTextKind.SINK,
+                ),
+                {int(frames[0].id): {"sink1", "sink2"}, int(frames[1].id): set()},
+            )
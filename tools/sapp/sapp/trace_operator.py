@@ -1,4 +1,16 @@
-from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple, Union
+from collections import defaultdict
+from typing import (
+    AbstractSet,
+    DefaultDict,
+    Dict,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
 
 import graphene
 from sqlalchemy.orm import Session, aliased
@@ -128,8 +140,8 @@ class TraceOperator:
         leaf_dicts: Tuple[Dict[int, str], Dict[int, str], Dict[int, str]],
         session: Session,
         current_run_id: DBID,
-        sources: Set[str],
-        sinks: Set[str],
+        sources: AbstractSet[str],
+        sinks: AbstractSet[str],
         initial_trace_frames: List[TraceFrameQueryResult],
         index: int = 0,
     ) -> List[Tuple[TraceFrameQueryResult, int]]:
@@ -178,8 +190,8 @@ class TraceOperator:
         leaf_dicts: Tuple[Dict[int, str], Dict[int, str], Dict[int, str]],
         session: Session,
         current_run_id: DBID,
-        sources: Set[str],
-        sinks: Set[str],
+        sources: AbstractSet[str],
+        sinks: AbstractSet[str],
         trace_frame: TraceFrameQueryResult,
         visited_ids: Set[int],
     ) -> List[TraceFrameQueryResult]:
@@ -199,8 +211,8 @@ class TraceOperator:
         leaf_dicts: Tuple[Dict[int, str], Dict[int, str], Dict[int, str]],
         session: Session,
         current_run_id: DBID,
-        sources: Set[str],
-        sinks: Set[str],
+        sources: AbstractSet[str],
+        sinks: AbstractSet[str],
         trace_frame: TraceFrameQueryResult,
         visited_ids: Set[int],
         backwards: bool = False,
@@ -242,32 +254,33 @@ class TraceOperator:
                 TraceFrame.caller_port == trace_frame.callee_port
             )
 
-        results = (
-            query.join(
+        results = [
+            frame
+            for frame in query.join(
                 TraceFrameLeafAssoc, TraceFrameLeafAssoc.trace_frame_id == TraceFrame.id
             )
             .group_by(TraceFrame.id)
             .order_by(TraceFrameLeafAssoc.trace_length, TraceFrame.callee_location)
-        )
+            if int(frame.id) not in visited_ids
+        ]
+        if not results:
+            return []
+
         filter_leaves = (
             sources if trace_frame.kind == TraceKind.POSTCONDITION else sinks
         )
+        leaves_by_trace_frame = TraceOperator.get_leaves_trace_frames(
+            leaf_dicts,
+            session,
+            [int(frame.id) for frame in results],
+            TraceOperator.trace_kind_to_shared_text_kind(results[0].kind),
+        )
 
-        filtered_results = []
-        for frame in results:
-            if int(frame.id) not in visited_ids and filter_leaves.intersection(
-                set(
-                    TraceOperator.get_leaves_trace_frame(
-                        leaf_dicts,
-                        session,
-                        int(frame.id),
-                        TraceOperator.trace_kind_to_shared_text_kind(frame.kind),
-                    )
-                )
-            ):
-                filtered_results.append(frame)
-
-        return filtered_results
+        return [
+            frame
+            for frame in results
+            if filter_leaves.intersection(leaves_by_trace_frame[int(frame.id)])
+        ]
 
     @staticmethod
     def get_leaves_trace_frame(
@@ -289,6 +302,37 @@ class TraceOperator:
             leaf_sources, leaf_sinks, features_dict, message_ids, kind
         )
 
+    @staticmethod
+    def get_leaves_trace_frames(
+        leaf_dicts: Tuple[Dict[int, str], Dict[int, str], Dict[int, str]],
+        session: Session,
+        trace_frame_ids: List[int],
+        kind: SharedTextKind,
+    ) -> Dict[int, Set[str]]:
+        """Like get_leaves_trace_frame, but for many trace frames in one query.
+        """
+        message_ids: DefaultDict[int, List[int]] = defaultdict(list)
+        for trace_frame_id, message_id in (
+            session.query(TraceFrameLeafAssoc.trace_frame_id, SharedText.id)
+            .distinct()
+            .join(SharedText, SharedText.id == TraceFrameLeafAssoc.leaf_id)
+            .filter(TraceFrameLeafAssoc.trace_frame_id.in_(trace_frame_ids))
+            .filter(SharedText.kind == kind)
+        ):
+            message_ids[int(trace_frame_id)].append(int(message_id))
+
+        leaf_sources, leaf_sinks, features_dict = leaf_dicts
+        return {
+            trace_frame_id: TraceOperator.leaf_dict_lookups(
+                leaf_sources,
+                leaf_sinks,
+                features_dict,
+                message_ids[trace_frame_id],
+                kind,
+            )
+            for trace_frame_id in trace_frame_ids
+        }
+
     @staticmethod
     def trace_kind_to_shared_text_kind(
         trace_kind: Optional[TraceKind],